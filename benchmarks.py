@@ -0,0 +1,178 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from main import RAW_FILE_TYPES, RandomDataGenerator, output_size, peak_rss, remove_output
+
+
+ROW_COUNTS = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+FILE_TYPES = ['csv', 'txt', 'json', 'jsonl', 'xlsx', 'columnar', 'sqlite', 'pgcopy', 'pgbinary']
+# openpyxl needs minutes per million rows, so larger xlsx runs are skipped unless asked for
+MAX_ROWS = {'xlsx': 1_000_000}
+COLUMN_TYPES = {
+    'string': ('string', {'length': 10, 'include_numbers': True, 'include_special': True}),
+    'integer': ('numeric', {'start': 0, 'end': 1_000_000}),
+    'float': ('numeric', {'start': 0, 'end': 1, 'is_float': True}),
+    'normal': ('numeric', {'distribution': 'normal', 'mean': 50, 'stddev': 10}),
+    'date': ('date', {'start_date': '2000-01-01', 'end_date': '2024-12-31'}),
+    'custom': ('custom', {'custom_values': ['red', 'green', 'blue', 'yellow']}),
+    'id': ('id', {}),
+    'phone': ('phone', {}),
+    'country': ('country', {}),
+}
+
+
+def build_generator(column_types, seed=0):
+    generator = RandomDataGenerator(seed)
+    for name in column_types:
+        data_type, kwargs = COLUMN_TYPES[name]
+        generator.add_column(name, data_type, 'random', **kwargs)
+    return generator
+
+
+def timed_batches(batches, timings):
+    # Time spent producing batches is generation; whatever the consumer does in between is writing
+    while True:
+        started = time.perf_counter()
+        try:
+            batch = next(batches)
+        except StopIteration:
+            return
+        finally:
+            timings['generate'] += time.perf_counter() - started
+        yield batch
+
+
+def run_case(column_types, num_rows, file_type, directory):
+    # Runs in a fresh process so the peak RSS belongs to this case alone
+    generator = build_generator(column_types)
+    generator.generate_columns(1)  # Warm up first-call costs outside the timed region
+    rss_before = peak_rss()
+    timings = {'generate': 0.0}
+    batches = generator.iter_batches(num_rows, raw=file_type in RAW_FILE_TYPES)
+    filename = os.path.join(directory, f'bench.{file_type}') if file_type else None
+    started = time.perf_counter()
+    if file_type is None:
+        for _ in timed_batches(batches, timings):
+            pass
+    else:
+        generator.write_batches(filename, file_type, timed_batches(batches, timings))
+    seconds = time.perf_counter() - started
+
+    result = {'seconds': seconds, 'generate_seconds': timings['generate'],
+              'write_seconds': seconds - timings['generate'] if file_type else 0.0,
+              'rows_per_sec': num_rows / seconds if seconds > 0 else None, 'bytes': None, 'peak_memory_bytes': None}
+    if rss_before is not None:
+        result['peak_memory_bytes'] = max(0, peak_rss() - rss_before)
+    if filename is not None:
+        result['bytes'] = output_size(filename)
+        remove_output(filename)
+    return result
+
+
+def benchmark_cases(row_counts, column_types, file_types, include_large_xlsx=False):
+    cases = []
+    for num_rows in row_counts:
+        for name in column_types:
+            cases.append((f'generate/{name}', [name], num_rows, None))
+        cases.append(('generate/mixed', column_types, num_rows, None))
+        for file_type in file_types:
+            if num_rows > MAX_ROWS.get(file_type, num_rows) and not include_large_xlsx:
+                continue
+            cases.append((f'write/{file_type}', column_types, num_rows, file_type))
+    return cases
+
+
+def run_benchmarks(cases, repeat=1, report=print):
+    context = multiprocessing.get_context('spawn')
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for case, column_types, num_rows, file_type in cases:
+            runs = []
+            for _ in range(repeat):
+                with ProcessPoolExecutor(1, mp_context=context) as executor:
+                    runs.append(executor.submit(run_case, column_types, num_rows, file_type, directory).result())
+            best = min(runs, key=lambda run: run['seconds'])
+            result = {'case': case, 'rows': num_rows, 'columns': column_types, 'file_type': file_type, **best}
+            results.append(result)
+            report(format_result(result))
+    return results
+
+
+def format_result(result):
+    memory = result['peak_memory_bytes']
+    memory = f"{memory / 2 ** 20:9.1f} MiB" if memory is not None else '      n/a'
+    return (f"{result['case']:<18} {result['rows']:>11,} rows {result['seconds']:9.3f}s "
+            f"{result['rows_per_sec'] or 0:>14,.0f} rows/s {memory}")
+
+
+def result_key(result):
+    return result['case'], result['rows'], tuple(result['columns'])
+
+
+def compare(results, baseline, threshold=0.1, memory_threshold=0.25):
+    # A case regresses when it is more than threshold slower or uses memory_threshold more peak memory
+    previous = {result_key(result): result for result in baseline['results']}
+    regressions = []
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None:
+            continue
+        if old['rows_per_sec'] and result['rows_per_sec'] < old['rows_per_sec'] * (1 - threshold):
+            regressions.append(f"{result['case']} @ {result['rows']:,} rows: "
+                               f"{result['rows_per_sec']:,.0f} rows/s vs {old['rows_per_sec']:,.0f} baseline")
+        old_memory = old.get('peak_memory_bytes')
+        memory = result.get('peak_memory_bytes')
+        # Small absolute differences are noise from the allocator, not regressions
+        if old_memory is not None and memory is not None and memory > max(old_memory * (1 + memory_threshold),
+                                                                           old_memory + 16 * 2 ** 20):
+            regressions.append(f"{result['case']} @ {result['rows']:,} rows: peak memory "
+                               f"{memory / 2 ** 20:,.1f} MiB vs {old_memory / 2 ** 20:,.1f} MiB baseline")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark data generation and every output format.")
+    parser.add_argument('--rows', type=int, nargs='+', default=ROW_COUNTS)
+    parser.add_argument('--types', nargs='+', choices=list(COLUMN_TYPES), default=list(COLUMN_TYPES))
+    parser.add_argument('--formats', nargs='*', choices=FILE_TYPES, default=FILE_TYPES)
+    parser.add_argument('--repeat', type=int, default=1, help="runs per case, the fastest is kept")
+    parser.add_argument('--include-large-xlsx', action='store_true')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', metavar='BASELINE', help="results file to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.1, help="allowed throughput drop, as a fraction")
+    args = parser.parse_args(argv)
+
+    cases = benchmark_cases(args.rows, args.types, args.formats, args.include_large_xlsx)
+    results = run_benchmarks(cases, args.repeat)
+    document = {
+        'meta': {'created': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+                 'numpy': np.__version__, 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'results': results,
+    }
+    with open(args.output, 'w') as output_file:
+        json.dump(document, output_file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions against", args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,487 @@
+import queue
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from main import RandomDataGenerator, remove_output, rows_from_batch
+
+
+PREVIEW_ROWS = 100
+VISIBLE_ROWS = 25
+# Smaller batches in the GUI keep progress updates and cancellation responsive
+GUI_BATCH_SIZE = 20_000
+PROGRESS_INTERVAL_MS = 100
+
+
+class PreviewTable:
+    # Treeview that only holds the rows currently on screen; scrolling asks the generator for the
+    # new window with generate_range, so the preview costs the same for any row count
+    def __init__(self, parent, generator, num_rows, visible_rows=VISIBLE_ROWS):
+        self.generator = generator
+        self.num_rows = num_rows
+        self.visible_rows = min(visible_rows, num_rows)
+        self.first = 0
+
+        columns = [col['name'] for col in generator.columns]
+        self.tree = ttk.Treeview(parent, columns=list(range(len(columns))), show='headings',
+                                 height=self.visible_rows)
+        for index, col in enumerate(columns):
+            self.tree.heading(index, text=col)
+            self.tree.column(index, minwidth=0, width=100, stretch=tk.NO)
+
+        self.scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(expand=True, fill=tk.BOTH)
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll_to(self.first + (-3 if event.delta > 0 else 3)))
+        self.tree.bind("<Button-4>", lambda event: self.scroll_to(self.first - 3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_to(self.first + 3))
+        self.render()
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * self.num_rows))
+        elif unit == 'pages':
+            self.scroll_to(self.first + int(amount) * self.visible_rows)
+        else:
+            self.scroll_to(self.first + int(amount))
+
+    def scroll_to(self, first):
+        first = max(0, min(first, self.num_rows - self.visible_rows))
+        if first != self.first:
+            self.first = first
+            self.render()
+        return "break"
+
+    def render(self):
+        stop = self.first + self.visible_rows
+        self.tree.delete(*self.tree.get_children())
+        for row in rows_from_batch(self.generator.generate_columns(self.visible_rows, self.first)):
+            self.tree.insert("", tk.END, values=row)
+        self.scrollbar.set(self.first / self.num_rows, stop / self.num_rows)
+
+
+class RandomDataGeneratorApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Random Data Generator")
+
+        self.generator = RandomDataGenerator()
+        self.progress_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.job = None
+
+        self.frame = ttk.Frame(root, padding="20")
+        self.frame.grid(row=0, column=0, sticky="nsew")
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        ttk.Label(self.frame, text="Column Name:").grid(row=0, column=0, padx=5, pady=5)
+        self.column_name_entry = ttk.Entry(self.frame)
+        self.column_name_entry.grid(row=0, column=1, padx=5, pady=5)
+
+        ttk.Label(self.frame, text="Data Type:").grid(row=1, column=0, padx=5, pady=5)
+        self.data_type_combo = ttk.Combobox(self.frame,
+                                            values=["string", "numeric", "date", "custom", "id", "phone", "country"])
+        self.data_type_combo.grid(row=1, column=1, padx=5, pady=5)
+        self.data_type_combo.bind("<<ComboboxSelected>>", self.on_data_type_selected)
+
+        ttk.Label(self.frame, text="Value Type:").grid(row=2, column=0, padx=5, pady=5)
+        self.value_type_combo = ttk.Combobox(self.frame, values=["random", "sequential"])
+        self.value_type_combo.grid(row=2, column=1, padx=5, pady=5)
+
+        self.random_options_frame = ttk.Frame(self.frame)
+        self.random_options_frame.grid(row=3, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+
+        self.start_label = ttk.Label(self.random_options_frame, text="Start:")
+        self.start_label.grid(row=0, column=0, padx=5, pady=5)
+        self.start_entry = ttk.Entry(self.random_options_frame, width=12)
+        self.start_entry.grid(row=0, column=1, padx=5, pady=5)
+
+        self.end_label = ttk.Label(self.random_options_frame, text="End:")
+        self.end_label.grid(row=1, column=0, padx=5, pady=5)
+        self.end_entry = ttk.Entry(self.random_options_frame, width=12)
+        self.end_entry.grid(row=1, column=1, padx=5, pady=5)
+
+        self.format_label = ttk.Label(self.random_options_frame, text="Date Format:")
+        self.format_label.grid(row=2, column=0, padx=5, pady=5)
+        self.format_combo = ttk.Combobox(self.random_options_frame, values=["%Y-%m-%d", "%m-%d-%Y", "%d-%m-%Y"])
+        self.format_combo.grid(row=2, column=1, padx=5, pady=5)
+        self.format_combo.current(0)
+
+        self.length_label = ttk.Label(self.random_options_frame, text="Length:")
+        self.length_label.grid(row=3, column=0, padx=5, pady=5)
+        self.length_entry = ttk.Entry(self.random_options_frame)
+        self.length_entry.grid(row=3, column=1, padx=5, pady=5)
+
+        self.custom_values_label = ttk.Label(self.random_options_frame, text="Custom Values (comma-separated):")
+        self.custom_values_label.grid(row=4, column=0, padx=5, pady=5)
+        self.custom_values_entry = ttk.Entry(self.random_options_frame, width=25)
+        self.custom_values_entry.grid(row=4, column=1, padx=5, pady=5)
+
+        self.include_numbers_var = tk.BooleanVar()
+        self.include_numbers_check = ttk.Checkbutton(self.random_options_frame, text="Include Numbers",
+                                                     variable=self.include_numbers_var)
+        self.include_numbers_check.grid(row=5, column=0, padx=5, pady=5, sticky="w")
+
+        self.include_special_var = tk.BooleanVar()
+        self.include_special_check = ttk.Checkbutton(self.random_options_frame, text="Include Special Characters",
+                                                     variable=self.include_special_var)
+        self.include_special_check.grid(row=5, column=1, padx=5, pady=5, sticky="w")
+
+        self.mean_label = ttk.Label(self.random_options_frame, text="Mean:")
+        self.mean_label.grid(row=6, column=0, padx=5, pady=5)
+        self.mean_entry = ttk.Entry(self.random_options_frame)
+        self.mean_entry.grid(row=6, column=1, padx=5, pady=5)
+
+        self.stddev_label = ttk.Label(self.random_options_frame, text="StdDev:")
+        self.stddev_label.grid(row=7, column=0, padx=5, pady=5)
+        self.stddev_entry = ttk.Entry(self.random_options_frame)
+        self.stddev_entry.grid(row=7, column=1, padx=5, pady=5)
+
+        self.distribution_label = ttk.Label(self.random_options_frame, text="Distribution:")
+        self.distribution_label.grid(row=8, column=0, padx=5, pady=5)
+        self.distribution_combo = ttk.Combobox(self.random_options_frame, values=["uniform", "normal"])
+        self.distribution_combo.grid(row=8, column=1, padx=5, pady=5)
+        self.distribution_combo.current(0)
+
+        self.add_column_button = ttk.Button(self.frame, text="Add Column", command=self.add_column)
+        self.add_column_button.grid(row=9, column=0, padx=5, pady=5)
+
+        self.added_column_label = ttk.Label(self.frame, text="")
+        self.added_column_label.grid(row=10, column=0, columnspan=2, padx=5, pady=5)
+
+        ttk.Label(self.frame, text="Number of Rows:").grid(row=11, column=0, padx=5, pady=5)
+        self.num_rows_entry = ttk.Entry(self.frame)
+        self.num_rows_entry.grid(row=11, column=1, padx=5, pady=5)
+
+        self.preview_button = ttk.Button(self.frame, text="Preview Data", command=self.preview_data)
+        self.preview_button.grid(row=12, column=0, padx=5, pady=5)
+
+        self.generate_button = ttk.Button(self.frame, text="Generate Data", command=self.generate_data)
+        self.generate_button.grid(row=12, column=1, padx=5, pady=5)
+
+        ttk.Label(self.frame, text="Save As:").grid(row=13, column=0, padx=5, pady=5)
+        self.save_type_combo = ttk.Combobox(self.frame, values=["csv", "xlsx", "txt", "json", "jsonl", "columnar",
+                                                                "sqlite", "pgcopy", "pgbinary"])
+        self.save_type_combo.grid(row=13, column=1, padx=5, pady=5)
+        self.save_type_combo.current(0)
+
+        self.save_button = ttk.Button(self.frame, text="Save Data", command=self.save_data)
+        self.save_button.grid(row=14, column=0, columnspan=2, padx=5, pady=5)
+
+        self.output_text = tk.Text(self.frame, height=10, width=50)
+        self.output_text.grid(row=15, column=0, columnspan=2, padx=5, pady=5)
+
+        self.progress_bar = ttk.Progressbar(self.frame, mode="determinate")
+        self.progress_bar.grid(row=16, column=0, columnspan=2, padx=5, pady=5, sticky="ew")
+
+        self.progress_label = ttk.Label(self.frame, text="")
+        self.progress_label.grid(row=17, column=0, padx=5, pady=5, sticky="w")
+
+        self.cancel_button = ttk.Button(self.frame, text="Cancel", command=self.cancel_job, state=tk.DISABLED)
+        self.cancel_button.grid(row=17, column=1, padx=5, pady=5)
+
+    def on_data_type_selected(self, event):
+        data_type = self.data_type_combo.get()
+        self.reset_random_options()
+        if data_type == "string":
+            self.random_options_frame.grid()
+            self.length_label.grid()
+            self.length_entry.grid()
+            self.include_numbers_check.grid()
+            self.include_special_check.grid()
+            self.start_label.grid_remove()
+            self.start_entry.grid_remove()
+            self.end_label.grid_remove()
+            self.end_entry.grid_remove()
+            self.format_label.grid_remove()
+            self.format_combo.grid_remove()
+            self.mean_label.grid_remove()
+            self.mean_entry.grid_remove()
+            self.stddev_label.grid_remove()
+            self.stddev_entry.grid_remove()
+            self.distribution_label.grid_remove()
+            self.distribution_combo.grid_remove()
+            self.custom_values_label.grid_remove()
+            self.custom_values_entry.grid_remove()
+        elif data_type == "numeric":
+            self.random_options_frame.grid()
+            self.length_label.grid_remove()
+            self.length_entry.grid_remove()
+            self.include_numbers_check.grid_remove()
+            self.include_special_check.grid_remove()
+            self.start_label.grid()
+            self.start_entry.grid()
+            self.end_label.grid()
+            self.end_entry.grid()
+            self.mean_label.grid()
+            self.mean_entry.grid()
+            self.stddev_label.grid()
+            self.stddev_entry.grid()
+            self.distribution_label.grid()
+            self.distribution_combo.grid()
+            self.format_label.grid_remove()
+            self.format_combo.grid_remove()
+            self.custom_values_label.grid_remove()
+            self.custom_values_entry.grid_remove()
+        elif data_type == "date":
+            self.random_options_frame.grid()
+            self.length_label.grid_remove()
+            self.length_entry.grid_remove()
+            self.include_numbers_check.grid_remove()
+            self.include_special_check.grid_remove()
+            self.start_label.grid()
+            self.start_entry.grid()
+            self.end_label.grid()
+            self.end_entry.grid()
+            self.format_label.grid()
+            self.format_combo.grid()
+            self.mean_label.grid_remove()
+            self.mean_entry.grid_remove()
+            self.stddev_label.grid_remove()
+            self.stddev_entry.grid_remove()
+            self.distribution_label.grid_remove()
+            self.distribution_combo.grid_remove()
+            self.custom_values_label.grid_remove()
+            self.custom_values_entry.grid_remove()
+        elif data_type == "custom":
+            self.random_options_frame.grid()
+            self.length_label.grid_remove()
+            self.length_entry.grid_remove()
+            self.include_numbers_check.grid_remove()
+            self.include_special_check.grid_remove()
+            self.start_label.grid_remove()
+            self.start_entry.grid_remove()
+            self.end_label.grid_remove()
+            self.end_entry.grid_remove()
+            self.format_label.grid_remove()
+            self.format_combo.grid_remove()
+            self.mean_label.grid_remove()
+            self.mean_entry.grid_remove()
+            self.stddev_label.grid_remove()
+            self.stddev_entry.grid_remove()
+            self.distribution_label.grid_remove()
+            self.distribution_combo.grid_remove()
+            self.custom_values_label.grid()
+            self.custom_values_entry.grid()
+        elif data_type == "id":
+            self.random_options_frame.grid_remove()
+        elif data_type == "phone":
+            self.random_options_frame.grid()
+            self.start_label.config(text="Country Code:")
+            self.start_entry.grid()
+            self.start_entry.delete(0, tk.END)
+            self.start_entry.insert(0, "+1")
+            self.end_label.config(text="Number Length:")
+            self.end_entry.grid()
+            self.end_entry.delete(0, tk.END)
+            self.end_entry.insert(0, "10")
+            self.length_label.grid_remove()
+            self.length_entry.grid_remove()
+            self.include_numbers_check.grid_remove()
+            self.include_special_check.grid_remove()
+            self.format_label.grid_remove()
+            self.format_combo.grid_remove()
+            self.mean_label.grid_remove()
+            self.mean_entry.grid_remove()
+            self.stddev_label.grid_remove()
+            self.stddev_entry.grid_remove()
+            self.distribution_label.grid_remove()
+            self.distribution_combo.grid_remove()
+            self.custom_values_label.grid_remove()
+            self.custom_values_entry.grid_remove()
+        elif data_type == "country":
+            self.random_options_frame.grid_remove()
+
+    def reset_random_options(self):
+        self.start_label.grid_remove()
+        self.start_entry.grid_remove()
+        self.end_label.grid_remove()
+        self.end_entry.grid_remove()
+        self.format_label.grid_remove()
+        self.format_combo.grid_remove()
+        self.length_label.grid_remove()
+        self.length_entry.grid_remove()
+        self.custom_values_label.grid_remove()
+        self.custom_values_entry.grid_remove()
+        self.include_numbers_check.grid_remove()
+        self.include_special_check.grid_remove()
+        self.mean_label.grid_remove()
+        self.mean_entry.grid_remove()
+        self.stddev_label.grid_remove()
+        self.stddev_entry.grid_remove()
+        self.distribution_label.grid_remove()
+        self.distribution_combo.grid_remove()
+
+    def add_column(self):
+        column_name = self.column_name_entry.get()
+        data_type = self.data_type_combo.get()
+        value_type = self.value_type_combo.get()
+        kwargs = {}
+        if data_type == "numeric":
+            kwargs["start"] = float(self.start_entry.get())
+            kwargs["end"] = float(self.end_entry.get())
+            kwargs["is_float"] = (value_type == "float")
+            kwargs["mean"] = float(self.mean_entry.get()) if self.mean_entry.get() else 0
+            kwargs["stddev"] = float(self.stddev_entry.get()) if self.stddev_entry.get() else 1
+            kwargs["distribution"] = self.distribution_combo.get()
+        elif data_type == "string":
+            kwargs["length"] = int(self.length_entry.get())
+            kwargs["include_numbers"] = self.include_numbers_var.get()
+            kwargs["include_special"] = self.include_special_var.get()
+        elif data_type == "date":
+            kwargs["start_date"] = self.start_entry.get()
+            kwargs["end_date"] = self.end_entry.get()
+            kwargs["format"] = self.format_combo.get()
+        elif data_type == "custom":
+            kwargs["custom_values"] = [val.strip() for val in self.custom_values_entry.get().split(",")]
+
+        try:
+            self.generator.add_column(column_name, data_type, value_type, **kwargs)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        self.column_name_entry.delete(0, tk.END)
+        self.start_entry.delete(0, tk.END)
+        self.end_entry.delete(0, tk.END)
+        self.length_entry.delete(0, tk.END)
+        self.custom_values_entry.delete(0, tk.END)
+
+        self.added_column_label.config(text=f"Column '{column_name}' added.")
+
+    def read_num_rows(self):
+        try:
+            num_rows = int(self.num_rows_entry.get())
+        except ValueError:
+            tk.messagebox.showerror("Error", "Please enter a valid number of rows.")
+            return None
+
+        if num_rows <= 0:
+            tk.messagebox.showerror("Error", "Number of rows must be greater than 0.")
+            return None
+        return num_rows
+
+    def generate_data(self):
+        # Rows are reproducible from the generator's seed, so only the head is drawn here and
+        # saving regenerates the full count batch by batch
+        num_rows = self.read_num_rows()
+        if num_rows is None:
+            return
+        self.output_text.delete('1.0', tk.END)
+        for row in self.generator.generate_range(0, min(num_rows, PREVIEW_ROWS)):
+            self.output_text.insert(tk.END, str(row) + "\n")
+        if num_rows > PREVIEW_ROWS:
+            self.output_text.insert(tk.END, f"... {num_rows - PREVIEW_ROWS} more rows\n")
+
+    def preview_data(self):
+        num_rows = self.read_num_rows()
+        if num_rows is None:
+            return
+
+        # Create a new window for preview data
+        preview_window = tk.Toplevel(self.root)
+        preview_window.title("Preview Data")
+        PreviewTable(preview_window, self.generator, num_rows)
+
+    def save_data(self):
+        # The row count is read at save time, so Preview Data followed by Save works as well as Generate Data
+        num_rows = self.read_num_rows()
+        if num_rows is None:
+            return
+        file_type = self.save_type_combo.get()
+        filename = filedialog.asksaveasfilename(defaultextension=f".{file_type}",
+                                                filetypes=[(file_type.upper(), f"*.{file_type}")])
+        if filename:
+            self.start_job(filename, file_type, num_rows)
+
+    def start_job(self, filename, file_type, num_rows):
+        self.job = {'filename': filename, 'file_type': file_type, 'num_rows': num_rows, 'done': 0,
+                    'started': time.monotonic()}
+        self.cancel_event = threading.Event()
+        self.set_busy(True)
+        self.progress_bar.configure(maximum=max(num_rows, 1), value=0)
+        self.progress_label.config(text=f"0 / {num_rows:,} rows")
+        worker = threading.Thread(target=self.run_job, args=(filename, file_type, num_rows), daemon=True)
+        worker.start()
+        self.root.after(PROGRESS_INTERVAL_MS, self.poll_job)
+
+    def run_job(self, filename, file_type, num_rows):
+        # Runs on the worker thread, which must not touch Tk widgets: everything goes through the queue
+        try:
+            self.generator.save_to_file(filename, file_type, num_rows=num_rows, batch_size=GUI_BATCH_SIZE,
+                                        progress=lambda done: self.progress_queue.put(('progress', done)),
+                                        cancel=self.cancel_event)
+        except Exception as e:
+            self.progress_queue.put(('error', str(e)))
+        else:
+            self.progress_queue.put(('finished', None))
+
+    def poll_job(self):
+        outcome = None
+        while True:
+            try:
+                kind, value = self.progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                self.job['done'] = value
+            else:
+                outcome = (kind, value)
+        self.show_progress()
+        if outcome is None:
+            self.root.after(PROGRESS_INTERVAL_MS, self.poll_job)
+            return
+
+        job = self.job
+        self.job = None
+        self.set_busy(False)
+        kind, value = outcome
+        if kind == 'error':
+            messagebox.showerror("Error", f"Saving failed: {value}")
+        elif job['done'] < job['num_rows']:
+            # A database file may hold other tables, so only the generated table is offered for removal
+            output = 'table' if job['file_type'] == 'sqlite' else 'file'
+            keep = messagebox.askyesno("Save Cancelled", f"Saved {job['done']:,} of {job['num_rows']:,} rows. "
+                                                         f"Keep the partial {output}?")
+            if not keep:
+                remove_output(job['filename'], job['file_type'])
+                self.progress_label.config(text=f"Cancelled, partial {output} removed")
+        else:
+            messagebox.showinfo("Save Data", f"Data saved successfully as {job['filename']}")
+
+    def show_progress(self):
+        done = self.job['done']
+        num_rows = self.job['num_rows']
+        elapsed = time.monotonic() - self.job['started']
+        rate = done / elapsed if elapsed > 0 else 0
+        text = f"{done:,} / {num_rows:,} rows, {rate:,.0f} rows/s"
+        if 0 < rate and done < num_rows:
+            text += f", ETA {(num_rows - done) / rate:.0f}s"
+        if self.cancel_event.is_set():
+            text = "Cancelling... " + text
+        self.progress_bar.configure(value=done)
+        self.progress_label.config(text=text)
+
+    def cancel_job(self):
+        self.cancel_event.set()
+        self.cancel_button.config(state=tk.DISABLED)
+
+    def set_busy(self, busy):
+        # The generator's columns must not change while a job is reading them
+        state = tk.DISABLED if busy else tk.NORMAL
+        for button in (self.add_column_button, self.generate_button, self.preview_button, self.save_button):
+            button.config(state=state)
+        self.cancel_button.config(state=tk.NORMAL if busy else tk.DISABLED)
+
+
+def run():
+    root = tk.Tk()
+    app = RandomDataGeneratorApp(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    run()
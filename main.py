@@ -1,439 +1,1666 @@
-import random
-import string
-from datetime import datetime, timedelta
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-import csv
-import json
-from openpyxl import Workbook
-import numpy as np
-
-
-class RandomDataGenerator:
-    def __init__(self):
-        self.columns = []
-        self.data = []
-
-    def add_column(self, name, data_type, value_type, **kwargs):
-        column = {'name': name, 'data_type': data_type, 'value_type': value_type, 'kwargs': kwargs}
-        self.columns.append(column)
-
-    def generate_data(self, num_rows):
-        self.data = []
-        for _ in range(num_rows):
-            row = {}
-            for column in self.columns:
-                name = column['name']
-                data_type = column['data_type']
-                value_type = column['value_type']
-                kwargs = column['kwargs']
-
-                if data_type == 'string':
-                    length = kwargs.get('length', 10)
-                    include_numbers = kwargs.get('include_numbers', False)
-                    include_special = kwargs.get('include_special', False)
-                    characters = string.ascii_letters
-                    if include_numbers:
-                        characters += string.digits
-                    if include_special:
-                        characters += string.punctuation
-                    value = ''.join(random.choices(characters, k=length))
-                elif data_type == 'numeric':
-                    mean = kwargs.get('mean', 0)
-                    stddev = kwargs.get('stddev', 1)
-                    distribution = kwargs.get('distribution', 'uniform')
-                    is_float = kwargs.get('is_float', False)
-                    if distribution == 'normal':
-                        value = np.random.normal(mean, stddev)
-                    else:
-                        start = kwargs.get('start', 0)
-                        end = kwargs.get('end', 100)
-                        if is_float:
-                            value = random.uniform(start, end)
-                        else:
-                            value = random.randint(start, end)
-                elif data_type == 'date':
-                    start_date = kwargs.get('start_date', '1970-01-01')
-                    end_date = kwargs.get('end_date', 'now')
-                    format = kwargs.get('format', '%Y-%m-%d')
-                    start_date = datetime.strptime(start_date, format)
-                    if end_date == 'now':
-                        end_date = datetime.now()
-                    else:
-                        end_date = datetime.strptime(end_date, format)
-                    value = start_date + timedelta(
-                        seconds=random.randint(0, int((end_date - start_date).total_seconds())))
-                    value = value.strftime(format)
-                elif data_type == 'custom':
-                    custom_values = kwargs.get('custom_values', [])
-                    value = random.choice(custom_values)
-                elif data_type == 'id':
-                    value = _  # Unique ID is just the row index
-                elif data_type == 'phone':
-                    country_code = kwargs.get('country_code', '+1')
-                    number_length = kwargs.get('number_length', 10)
-                    value = country_code + ''.join(random.choices(string.digits, k=number_length))
-                elif data_type == 'country':
-                    value = random.choice(
-                        ['USA', 'Canada', 'UK', 'Germany', 'France', 'Australia', 'India', 'China', 'Japan', 'Brazil'])
-
-                row[name] = value
-            self.data.append(row)
-
-        return self.data
-
-    def save_to_file(self, filename, file_type):
-        if file_type == 'csv':
-            with open(filename, 'w', newline='') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=[col['name'] for col in self.columns])
-                writer.writeheader()
-                for row in self.data:
-                    writer.writerow(row)
-        elif file_type == 'xlsx':
-            wb = Workbook()
-            ws = wb.active
-            for col_index, column in enumerate(self.columns, start=1):
-                ws.cell(row=1, column=col_index, value=column['name'])
-                for row_index, row in enumerate(self.data, start=2):
-                    ws.cell(row=row_index, column=col_index, value=row[column['name']])
-            wb.save(filename)
-        elif file_type == 'txt':
-            with open(filename, 'w') as txtfile:
-                for row in self.data:
-                    txtfile.write(str(row) + '\n')
-        elif file_type == 'json':
-            with open(filename, 'w') as jsonfile:
-                json.dump(self.data, jsonfile)
-        else:
-            # Handle unsupported file types
-            pass
-
-
-class RandomDataGeneratorApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Random Data Generator")
-
-        self.generator = RandomDataGenerator()
-
-        self.frame = ttk.Frame(root, padding="20")
-        self.frame.grid(row=0, column=0, sticky="nsew")
-
-        self.create_widgets()
-
-    def create_widgets(self):
-        ttk.Label(self.frame, text="Column Name:").grid(row=0, column=0, padx=5, pady=5)
-        self.column_name_entry = ttk.Entry(self.frame)
-        self.column_name_entry.grid(row=0, column=1, padx=5, pady=5)
-
-        ttk.Label(self.frame, text="Data Type:").grid(row=1, column=0, padx=5, pady=5)
-        self.data_type_combo = ttk.Combobox(self.frame,
-                                            values=["string", "numeric", "date", "custom", "id", "phone", "country"])
-        self.data_type_combo.grid(row=1, column=1, padx=5, pady=5)
-        self.data_type_combo.bind("<<ComboboxSelected>>", self.on_data_type_selected)
-
-        ttk.Label(self.frame, text="Value Type:").grid(row=2, column=0, padx=5, pady=5)
-        self.value_type_combo = ttk.Combobox(self.frame, values=["random", "sequential"])
-        self.value_type_combo.grid(row=2, column=1, padx=5, pady=5)
-
-        self.random_options_frame = ttk.Frame(self.frame)
-        self.random_options_frame.grid(row=3, column=0, columnspan=2, padx=5, pady=5, sticky="w")
-
-        self.start_label = ttk.Label(self.random_options_frame, text="Start:")
-        self.start_label.grid(row=0, column=0, padx=5, pady=5)
-        self.start_entry = ttk.Entry(self.random_options_frame, width=12)
-        self.start_entry.grid(row=0, column=1, padx=5, pady=5)
-
-        self.end_label = ttk.Label(self.random_options_frame, text="End:")
-        self.end_label.grid(row=1, column=0, padx=5, pady=5)
-        self.end_entry = ttk.Entry(self.random_options_frame, width=12)
-        self.end_entry.grid(row=1, column=1, padx=5, pady=5)
-
-        self.format_label = ttk.Label(self.random_options_frame, text="Date Format:")
-        self.format_label.grid(row=2, column=0, padx=5, pady=5)
-        self.format_combo = ttk.Combobox(self.random_options_frame, values=["%Y-%m-%d", "%m-%d-%Y", "%d-%m-%Y"])
-        self.format_combo.grid(row=2, column=1, padx=5, pady=5)
-        self.format_combo.current(0)
-
-        self.length_label = ttk.Label(self.random_options_frame, text="Length:")
-        self.length_label.grid(row=3, column=0, padx=5, pady=5)
-        self.length_entry = ttk.Entry(self.random_options_frame)
-        self.length_entry.grid(row=3, column=1, padx=5, pady=5)
-
-        self.custom_values_label = ttk.Label(self.random_options_frame, text="Custom Values (comma-separated):")
-        self.custom_values_label.grid(row=4, column=0, padx=5, pady=5)
-        self.custom_values_entry = ttk.Entry(self.random_options_frame, width=25)
-        self.custom_values_entry.grid(row=4, column=1, padx=5, pady=5)
-
-        self.include_numbers_var = tk.BooleanVar()
-        self.include_numbers_check = ttk.Checkbutton(self.random_options_frame, text="Include Numbers",
-                                                     variable=self.include_numbers_var)
-        self.include_numbers_check.grid(row=5, column=0, padx=5, pady=5, sticky="w")
-
-        self.include_special_var = tk.BooleanVar()
-        self.include_special_check = ttk.Checkbutton(self.random_options_frame, text="Include Special Characters",
-                                                     variable=self.include_special_var)
-        self.include_special_check.grid(row=5, column=1, padx=5, pady=5, sticky="w")
-
-        self.mean_label = ttk.Label(self.random_options_frame, text="Mean:")
-        self.mean_label.grid(row=6, column=0, padx=5, pady=5)
-        self.mean_entry = ttk.Entry(self.random_options_frame)
-        self.mean_entry.grid(row=6, column=1, padx=5, pady=5)
-
-        self.stddev_label = ttk.Label(self.random_options_frame, text="StdDev:")
-        self.stddev_label.grid(row=7, column=0, padx=5, pady=5)
-        self.stddev_entry = ttk.Entry(self.random_options_frame)
-        self.stddev_entry.grid(row=7, column=1, padx=5, pady=5)
-
-        self.distribution_label = ttk.Label(self.random_options_frame, text="Distribution:")
-        self.distribution_label.grid(row=8, column=0, padx=5, pady=5)
-        self.distribution_combo = ttk.Combobox(self.random_options_frame, values=["uniform", "normal"])
-        self.distribution_combo.grid(row=8, column=1, padx=5, pady=5)
-        self.distribution_combo.current(0)
-
-        self.add_column_button = ttk.Button(self.frame, text="Add Column", command=self.add_column)
-        self.add_column_button.grid(row=9, column=0, padx=5, pady=5)
-
-        self.added_column_label = ttk.Label(self.frame, text="")
-        self.added_column_label.grid(row=10, column=0, columnspan=2, padx=5, pady=5)
-
-        ttk.Label(self.frame, text="Number of Rows:").grid(row=11, column=0, padx=5, pady=5)
-        self.num_rows_entry = ttk.Entry(self.frame)
-        self.num_rows_entry.grid(row=11, column=1, padx=5, pady=5)
-
-        self.preview_button = ttk.Button(self.frame, text="Preview Data", command=self.preview_data)
-        self.preview_button.grid(row=12, column=0, padx=5, pady=5)
-
-        self.generate_button = ttk.Button(self.frame, text="Generate Data", command=self.generate_data)
-        self.generate_button.grid(row=12, column=1, padx=5, pady=5)
-
-        ttk.Label(self.frame, text="Save As:").grid(row=13, column=0, padx=5, pady=5)
-        self.save_type_combo = ttk.Combobox(self.frame, values=["csv", "xlsx", "txt", "json"])
-        self.save_type_combo.grid(row=13, column=1, padx=5, pady=5)
-        self.save_type_combo.current(0)
-
-        self.save_button = ttk.Button(self.frame, text="Save Data", command=self.save_data)
-        self.save_button.grid(row=14, column=0, columnspan=2, padx=5, pady=5)
-
-        self.output_text = tk.Text(self.frame, height=10, width=50)
-        self.output_text.grid(row=15, column=0, columnspan=2, padx=5, pady=5)
-
-    def on_data_type_selected(self, event):
-        data_type = self.data_type_combo.get()
-        self.reset_random_options()
-        if data_type == "string":
-            self.random_options_frame.grid()
-            self.length_label.grid()
-            self.length_entry.grid()
-            self.include_numbers_check.grid()
-            self.include_special_check.grid()
-            self.start_label.grid_remove()
-            self.start_entry.grid_remove()
-            self.end_label.grid_remove()
-            self.end_entry.grid_remove()
-            self.format_label.grid_remove()
-            self.format_combo.grid_remove()
-            self.mean_label.grid_remove()
-            self.mean_entry.grid_remove()
-            self.stddev_label.grid_remove()
-            self.stddev_entry.grid_remove()
-            self.distribution_label.grid_remove()
-            self.distribution_combo.grid_remove()
-            self.custom_values_label.grid_remove()
-            self.custom_values_entry.grid_remove()
-        elif data_type == "numeric":
-            self.random_options_frame.grid()
-            self.length_label.grid_remove()
-            self.length_entry.grid_remove()
-            self.include_numbers_check.grid_remove()
-            self.include_special_check.grid_remove()
-            self.start_label.grid()
-            self.start_entry.grid()
-            self.end_label.grid()
-            self.end_entry.grid()
-            self.mean_label.grid()
-            self.mean_entry.grid()
-            self.stddev_label.grid()
-            self.stddev_entry.grid()
-            self.distribution_label.grid()
-            self.distribution_combo.grid()
-            self.format_label.grid_remove()
-            self.format_combo.grid_remove()
-            self.custom_values_label.grid_remove()
-            self.custom_values_entry.grid_remove()
-        elif data_type == "date":
-            self.random_options_frame.grid()
-            self.length_label.grid_remove()
-            self.length_entry.grid_remove()
-            self.include_numbers_check.grid_remove()
-            self.include_special_check.grid_remove()
-            self.start_label.grid()
-            self.start_entry.grid()
-            self.end_label.grid()
-            self.end_entry.grid()
-            self.format_label.grid()
-            self.format_combo.grid()
-            self.mean_label.grid_remove()
-            self.mean_entry.grid_remove()
-            self.stddev_label.grid_remove()
-            self.stddev_entry.grid_remove()
-            self.distribution_label.grid_remove()
-            self.distribution_combo.grid_remove()
-            self.custom_values_label.grid_remove()
-            self.custom_values_entry.grid_remove()
-        elif data_type == "custom":
-            self.random_options_frame.grid()
-            self.length_label.grid_remove()
-            self.length_entry.grid_remove()
-            self.include_numbers_check.grid_remove()
-            self.include_special_check.grid_remove()
-            self.start_label.grid_remove()
-            self.start_entry.grid_remove()
-            self.end_label.grid_remove()
-            self.end_entry.grid_remove()
-            self.format_label.grid_remove()
-            self.format_combo.grid_remove()
-            self.mean_label.grid_remove()
-            self.mean_entry.grid_remove()
-            self.stddev_label.grid_remove()
-            self.stddev_entry.grid_remove()
-            self.distribution_label.grid_remove()
-            self.distribution_combo.grid_remove()
-            self.custom_values_label.grid()
-            self.custom_values_entry.grid()
-        elif data_type == "id":
-            self.random_options_frame.grid_remove()
-        elif data_type == "phone":
-            self.random_options_frame.grid()
-            self.start_label.config(text="Country Code:")
-            self.start_entry.grid()
-            self.start_entry.delete(0, tk.END)
-            self.start_entry.insert(0, "+1")
-            self.end_label.config(text="Number Length:")
-            self.end_entry.grid()
-            self.end_entry.delete(0, tk.END)
-            self.end_entry.insert(0, "10")
-            self.length_label.grid_remove()
-            self.length_entry.grid_remove()
-            self.include_numbers_check.grid_remove()
-            self.include_special_check.grid_remove()
-            self.format_label.grid_remove()
-            self.format_combo.grid_remove()
-            self.mean_label.grid_remove()
-            self.mean_entry.grid_remove()
-            self.stddev_label.grid_remove()
-            self.stddev_entry.grid_remove()
-            self.distribution_label.grid_remove()
-            self.distribution_combo.grid_remove()
-            self.custom_values_label.grid_remove()
-            self.custom_values_entry.grid_remove()
-        elif data_type == "country":
-            self.random_options_frame.grid_remove()
-
-    def reset_random_options(self):
-        self.start_label.grid_remove()
-        self.start_entry.grid_remove()
-        self.end_label.grid_remove()
-        self.end_entry.grid_remove()
-        self.format_label.grid_remove()
-        self.format_combo.grid_remove()
-        self.length_label.grid_remove()
-        self.length_entry.grid_remove()
-        self.custom_values_label.grid_remove()
-        self.custom_values_entry.grid_remove()
-        self.include_numbers_check.grid_remove()
-        self.include_special_check.grid_remove()
-        self.mean_label.grid_remove()
-        self.mean_entry.grid_remove()
-        self.stddev_label.grid_remove()
-        self.stddev_entry.grid_remove()
-        self.distribution_label.grid_remove()
-        self.distribution_combo.grid_remove()
-
-    def add_column(self):
-        column_name = self.column_name_entry.get()
-        data_type = self.data_type_combo.get()
-        value_type = self.value_type_combo.get()
-        kwargs = {}
-        if data_type == "numeric":
-            kwargs["start"] = float(self.start_entry.get())
-            kwargs["end"] = float(self.end_entry.get())
-            kwargs["is_float"] = (value_type == "float")
-            kwargs["mean"] = float(self.mean_entry.get()) if self.mean_entry.get() else 0
-            kwargs["stddev"] = float(self.stddev_entry.get()) if self.stddev_entry.get() else 1
-            kwargs["distribution"] = self.distribution_combo.get()
-        elif data_type == "string":
-            kwargs["length"] = int(self.length_entry.get())
-            kwargs["include_numbers"] = self.include_numbers_var.get()
-            kwargs["include_special"] = self.include_special_var.get()
-        elif data_type == "date":
-            kwargs["start_date"] = self.start_entry.get()
-            kwargs["end_date"] = self.end_entry.get()
-            kwargs["format"] = self.format_combo.get()
-        elif data_type == "custom":
-            kwargs["custom_values"] = [val.strip() for val in self.custom_values_entry.get().split(",")]
-
-        self.generator.add_column(column_name, data_type, value_type, **kwargs)
-
-        self.column_name_entry.delete(0, tk.END)
-        self.start_entry.delete(0, tk.END)
-        self.end_entry.delete(0, tk.END)
-        self.length_entry.delete(0, tk.END)
-        self.custom_values_entry.delete(0, tk.END)
-
-        self.added_column_label.config(text=f"Column '{column_name}' added.")
-
-    def generate_data(self):
-        self.output_text.delete('1.0', tk.END)
-        num_rows = int(self.num_rows_entry.get())
-        data = self.generator.generate_data(num_rows)
-        for row in data:
-            self.output_text.insert(tk.END, str(row) + "\n")
-
-    def preview_data(self):
-        try:
-            num_rows = int(self.num_rows_entry.get())
-        except ValueError:
-            tk.messagebox.showerror("Error", "Please enter a valid number of rows.")
-            return
-
-        if num_rows <= 0:
-            tk.messagebox.showerror("Error", "Number of rows must be greater than 0.")
-            return
-
-        data = self.generator.generate_data(num_rows)
-
-        # Create a new window for preview data
-        preview_window = tk.Toplevel(self.root)
-        preview_window.title("Preview Data")
-
-        # Add a table to the new window
-        columns = [col['name'] for col in self.generator.columns]
-        tree = ttk.Treeview(preview_window, columns=columns, show='headings')
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, minwidth=0, width=100, stretch=tk.NO)
-
-        for row in data:
-            tree.insert("", tk.END, values=[row[col] for col in columns])
-
-        tree.pack(expand=True, fill=tk.BOTH)
-
-        # Add a scrollbar to the table
-        scrollbar = ttk.Scrollbar(preview_window, orient=tk.VERTICAL, command=tree.yview)
-        tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-    def save_data(self):
-        file_type = self.save_type_combo.get()
-        filename = filedialog.asksaveasfilename(defaultextension=f".{file_type}",
-                                                filetypes=[(file_type.upper(), f"*.{file_type}")])
-        if filename:
-            self.generator.save_to_file(filename, file_type)
-            messagebox.showinfo("Save Data", f"Data saved successfully as {filename}")
-
-
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = RandomDataGeneratorApp(root)
-    root.mainloop()
+import argparse
+import string
+from datetime import datetime, timedelta
+import functools
+import gzip
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+COUNTRIES = np.array(['USA', 'Canada', 'UK', 'Germany', 'France', 'Australia', 'India', 'China', 'Japan', 'Brazil'])
+DIGITS = np.frombuffer(string.digits.encode(), dtype=np.uint8)
+EPOCH = datetime(1970, 1, 1)
+BATCH_SIZE = 100_000
+SHARD_ROWS = 1_000_000
+EXCEL_MAX_ROWS = 1_048_576
+FANOUT_BLOCK = 65_536  # Parents per block when mapping child rows back to their parents
+BLOCK_BYTES = 4 * 1024 * 1024
+# Output extensions that turn on compression from the command line
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.zst': 'zstd'}
+# File types formatted by format_batch and written through BlockWriter, so they can be compressed
+STREAM_FILE_TYPES = {'csv', 'txt', 'json', 'jsonl', 'pgcopy', 'pgbinary'}
+# File types written from native arrays rather than display values
+RAW_FILE_TYPES = {'columnar', 'pgcopy', 'pgbinary'}
+OUTPUT_FILE_TYPES = STREAM_FILE_TYPES | RAW_FILE_TYPES | {'xlsx', 'sqlite'}
+# Columns of these SQL kinds always get the same columnar dtype, whatever values a single batch holds
+COLUMNAR_DTYPES = {'integer': '<i8', 'float': '<f8', 'boolean': '|b1', 'text': 'string'}
+# Bulk loading settings: the database is being filled from scratch and can simply be generated again,
+# so durability is traded for speed, and rows are committed in large transactions
+SQLITE_PRAGMAS = ['PRAGMA journal_mode = MEMORY', 'PRAGMA synchronous = OFF', 'PRAGMA temp_store = MEMORY',
+                  'PRAGMA cache_size = -65536']
+SQLITE_TRANSACTION_ROWS = 1_000_000
+# COPY binary: signature, flags and header extension length, then -1 as the field count ends the data
+PGCOPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + bytes(8)
+PGCOPY_TRAILER = b'\xff\xff'
+PG_EPOCH = np.datetime64('2000-01-01T00:00:00', 'us')
+SQL_TYPES = {
+    'sqlite': {'integer': 'INTEGER', 'float': 'REAL', 'boolean': 'INTEGER', 'date': 'TEXT', 'timestamp': 'TEXT',
+               'text': 'TEXT'},
+    'postgres': {'integer': 'bigint', 'float': 'double precision', 'boolean': 'boolean', 'date': 'date',
+                 'timestamp': 'timestamp', 'text': 'text'},
+}
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+DATE_FIELDS = {'Y': 4, 'm': 2, 'd': 2, 'H': 2, 'M': 2, 'S': 2}
+# The time unit each strftime directive shows, finest unit first
+DATE_UNITS = {'s': 'SsTXcrf', 'm': 'MR', 'h': 'HIklp', 'D': 'dejaAwuxDFUWV', 'M': 'mbBh', 'Y': 'YyCGg'}
+
+
+def strings_from_codes(codes):
+    # Reinterpret an (n, k) matrix of ASCII codes as n strings of length k
+    num_rows, width = codes.shape
+    if width == 0:
+        return np.full(num_rows, '', dtype='U1')
+    return np.ascontiguousarray(codes, dtype=np.uint8).view(f'S{width}').reshape(num_rows).astype(f'U{width}')
+
+
+def digit_codes(values, width):
+    # Zero-padded decimal ASCII codes of non-negative integers, shape (n, width)
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return (values[:, None] // powers % 10 + ord('0')).astype(np.uint8)
+
+
+def format_dates(seconds, format):
+    tokens = []
+    i = 0
+    while i < len(format):
+        if format[i] == '%' and i + 1 < len(format):
+            directive = format[i + 1]
+            if directive in DATE_FIELDS:
+                tokens.append(directive)
+            elif directive == '%':
+                tokens.append(b'%')
+            else:
+                tokens = None
+                break
+            i += 2
+        elif format[i].isascii():
+            tokens.append(format[i].encode())
+            i += 1
+        else:
+            tokens = None
+            break
+
+    moments = seconds.astype('datetime64[s]')
+    days = moments.astype('datetime64[D]')
+    months = moments.astype('datetime64[M]')
+    years = moments.astype('datetime64[Y]').astype(np.int64) + 1970
+    if tokens is None or (len(years) and (years.min() < 1000 or years.max() > 9999)):
+        # Directives strftime handles but the vectorized path does not
+        return np.array([(EPOCH + timedelta(seconds=int(s))).strftime(format) for s in seconds])
+
+    seconds_of_day = (moments - days).astype(np.int64)
+    fields = {
+        'Y': years,
+        'm': months.astype(np.int64) % 12 + 1,
+        'd': (days - months).astype(np.int64) + 1,
+        'H': seconds_of_day // 3600,
+        'M': seconds_of_day // 60 % 60,
+        'S': seconds_of_day % 60,
+    }
+    parts = []
+    for token in tokens:
+        if isinstance(token, bytes):
+            parts.append(np.broadcast_to(np.frombuffer(token, dtype=np.uint8), (len(seconds), 1)))
+        else:
+            parts.append(digit_codes(fields[token], DATE_FIELDS[token]))
+    if not parts:
+        return np.full(len(seconds), '', dtype='U1')
+    return strings_from_codes(np.hstack(parts))
+
+
+def date_unit(format):
+    # The finest unit a format displays; raw dates are truncated to it so that every output carries the same value
+    directives = set()
+    i = 0
+    while i < len(format) - 1:
+        if format[i] == '%':
+            directives.add(format[i + 1] if format[i + 1] not in '-#' else format[i + 2:i + 3])
+            i += 2
+        else:
+            i += 1
+    for unit, letters in DATE_UNITS.items():
+        if directives & set(letters):
+            return unit
+    return 'D'
+
+
+def parse_date(value, format):
+    # A date string in format, 'now', or seconds since the epoch
+    if isinstance(value, int):
+        return value
+    if value == 'now':
+        return int((datetime.now() - EPOCH).total_seconds())
+    return int((datetime.strptime(value, format) - EPOCH).total_seconds())
+
+
+def uniforms_from_words(words):
+    return (words >> np.uint64(11)) * (1.0 / 2 ** 53)
+
+
+def integers_from_words(words, count):
+    # Values in [0, count); the modulo bias is below count / 2**64
+    if count <= 0:
+        raise ValueError('cannot choose from an empty range')
+    return (words % np.uint64(count)).astype(np.int64)
+
+
+def stream_words(key, draws, num_rows, start):
+    # Row i always reads words [i * per_row, (i + 1) * per_row) of the Philox stream with this key
+    per_row = -(-draws // 4) * 4
+    if draws == 0 or num_rows == 0:
+        return np.empty((num_rows, draws), dtype=np.uint64)
+    bit_generator = np.random.Philox(key=key, counter=start * per_row // 4)
+    return bit_generator.random_raw(num_rows * per_row).reshape(num_rows, per_row)[:, :draws]
+
+
+def rows_from_columns(columns, num_rows):
+    if not columns:
+        return [{} for _ in range(num_rows)]
+    names = list(columns)
+    return [dict(zip(names, row)) for row in rows_from_batch(columns)]
+
+
+def rows_from_batch(batch):
+    return zip(*[values.tolist() for values in batch.values()])
+
+
+def batch_rows(batch):
+    return len(next(iter(batch.values()))) if batch else 0
+
+
+def track_batches(batches, progress=None, cancel=None):
+    # Reports the running row count after each batch and stops early once cancel (a threading.Event) is set;
+    # writers then finish the file normally, so a cancelled export is still a valid, shorter file
+    done = 0
+    for batch in batches:
+        if cancel is not None and cancel.is_set():
+            return
+        yield batch
+        done += batch_rows(batch)
+        if progress is not None:
+            progress(done)
+
+
+class Permutation:
+    # Keyed bijection of [0, size) for size <= 2**64: a Feistel network over the smallest even number of
+    # bits that covers size, with cycle-walking for outputs that land outside the range
+    rounds = 6
+
+    def __init__(self, size, key):
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        self.half = np.uint64((bits + 1) // 2)
+        self.mask = np.uint64((1 << int(self.half)) - 1)
+        self.round_keys = np.random.SeedSequence([int(word) for word in key] + [self.rounds]).generate_state(
+            self.rounds, np.uint64)
+
+    def shuffle(self, values):
+        left = values >> self.half
+        right = values & self.mask
+        for round_key in self.round_keys:
+            # splitmix64-style mixing; uint64 arithmetic wraps around as intended
+            mixed = (right ^ round_key) * np.uint64(0x9E3779B97F4A7C15)
+            mixed ^= mixed >> np.uint64(29)
+            mixed *= np.uint64(0xBF58476D1CE4E5B9)
+            mixed ^= mixed >> np.uint64(32)
+            left, right = right, left ^ (mixed & self.mask)
+        return (left << self.half) | right
+
+    def __call__(self, indices):
+        values = self.shuffle(np.asarray(indices, dtype=np.uint64))
+        if self.size < 2 ** 64:
+            outside = values >= np.uint64(self.size)
+            while outside.any():
+                values[outside] = self.shuffle(values[outside])
+                outside = values >= np.uint64(self.size)
+        return values
+
+
+def radix_digits(values, base, count):
+    # Base-`base` digits of uint64 values, most significant first, shape (n, count)
+    digits = np.empty((len(values), count), dtype=np.uint64)
+    values = values.copy()
+    for position in range(count - 1, -1, -1):
+        digits[:, position] = values % np.uint64(base)
+        values //= np.uint64(base)
+    return digits
+
+
+def unique_digit_count(base, length):
+    # How many trailing digits a 64-bit permutation index can cover
+    count = 0
+    while count < length and base ** (count + 1) <= 2 ** 64:
+        count += 1
+    return count
+
+
+class ColumnSampler:
+    # Compiled form of a column: all kwargs parsing and table building happens once, in __init__.
+    # draws is the number of 64-bit random words the column consumes per row. With raw=True sample
+    # returns native arrays (dates as datetime64) instead of their display form. capacity is the
+    # number of distinct rows a unique=True column can produce, None when it is unbounded (id). kind is
+    # the SQL type family of its values (a key of SQL_TYPES[dialect]) for database outputs.
+    draws = 0
+    capacity = None
+    kind = 'text'
+
+    def __init__(self, column):
+        self.column = column
+        self.name = column['name']
+        self.unique = bool(column['kwargs'].get('unique', False))
+        self.key = None
+
+    def bind(self, key):
+        # Called by the generator with the column's (seed, position) key
+        self.key = key
+
+    def unique_rows(self, row_start, num_rows):
+        return self.permutation(np.arange(row_start, row_start + num_rows, dtype=np.uint64))
+
+    def sample(self, words, row_start, raw=False):
+        return np.full(len(words), None, dtype=object)
+
+
+class StringSampler(ColumnSampler):
+    def __init__(self, column):
+        super().__init__(column)
+        kwargs = column['kwargs']
+        characters = string.ascii_letters
+        if kwargs.get('include_numbers', False):
+            characters += string.digits
+        if kwargs.get('include_special', False):
+            characters += string.punctuation
+        self.alphabet = np.frombuffer(characters.encode(), dtype=np.uint8)
+        self.length = int(kwargs.get('length', 10))
+        if self.length < 0:
+            raise ValueError(f"Column '{self.name}': length must not be negative")
+        self.draws = self.length
+        if self.unique:
+            # The last unique_digits characters spell a permuted row index, the rest stay random
+            self.unique_digits = unique_digit_count(len(self.alphabet), self.length)
+            self.capacity = len(self.alphabet) ** self.unique_digits
+            self.draws = self.length - self.unique_digits
+
+    def bind(self, key):
+        super().bind(key)
+        if self.unique:
+            self.permutation = Permutation(len(self.alphabet) ** self.unique_digits, key)
+
+    def sample(self, words, row_start, raw=False):
+        indices = words % np.uint64(len(self.alphabet))
+        if self.unique:
+            digits = radix_digits(self.unique_rows(row_start, len(words)), len(self.alphabet), self.unique_digits)
+            indices = np.hstack([indices, digits])
+        return strings_from_codes(self.alphabet[indices])
+
+
+class NumericSampler(ColumnSampler):
+    def __init__(self, column):
+        super().__init__(column)
+        kwargs = column['kwargs']
+        self.distribution = kwargs.get('distribution', 'uniform')
+        self.is_float = kwargs.get('is_float', False)
+        self.kind = 'float' if self.distribution == 'normal' or self.is_float else 'integer'
+        if self.distribution == 'normal':
+            self.mean = float(kwargs.get('mean', 0))
+            self.stddev = float(kwargs.get('stddev', 1))
+            self.draws = 2
+        else:
+            self.start = kwargs.get('start', 0)
+            self.end = kwargs.get('end', 100)
+            if not self.is_float:
+                self.start = int(self.start)
+                self.count = int(self.end) - self.start + 1
+                if self.count <= 0:
+                    raise ValueError(f"Column '{self.name}': end must not be less than start")
+            self.draws = 1
+        if self.unique:
+            if self.distribution == 'normal' or self.is_float:
+                raise ValueError(f"Column '{self.name}': unique numeric columns must be uniform integers")
+            if self.start < -2 ** 63 or self.start + self.count > 2 ** 63:
+                raise ValueError(f"Column '{self.name}': unique range must fit in 64-bit integers")
+            self.capacity = self.count
+            self.draws = 0
+
+    def bind(self, key):
+        super().bind(key)
+        if self.unique:
+            self.permutation = Permutation(self.count, key)
+
+    def sample(self, words, row_start, raw=False):
+        if self.distribution == 'normal':
+            # Box-Muller on two words per row
+            uniforms = uniforms_from_words(words)
+            radius = np.sqrt(-2.0 * np.log1p(-uniforms[:, 0]))
+            return self.mean + self.stddev * radius * np.cos(2.0 * np.pi * uniforms[:, 1])
+        if self.is_float:
+            return self.start + (self.end - self.start) * uniforms_from_words(words[:, 0])
+        if self.unique:
+            return self.start + self.unique_rows(row_start, len(words)).astype(np.int64)
+        return self.start + integers_from_words(words[:, 0], self.count)
+
+
+class DateSampler(ColumnSampler):
+    draws = 1
+
+    def __init__(self, column):
+        super().__init__(column)
+        kwargs = column['kwargs']
+        self.format = kwargs.get('format', '%Y-%m-%d')
+        self.unit = date_unit(self.format)
+        self.kind = 'date' if self.unit in 'DMY' else 'timestamp'
+        self.start_date = parse_date(kwargs.get('start_date', '1970-01-01'), self.format)
+        self.end_date = parse_date(kwargs.get('end_date', 'now'), self.format)
+        if self.end_date < self.start_date:
+            raise ValueError(f"Column '{self.name}': end_date is before start_date")
+
+    def sample(self, words, row_start, raw=False):
+        seconds = self.start_date + integers_from_words(words[:, 0], self.end_date - self.start_date + 1)
+        if raw:
+            return seconds.astype('datetime64[s]').astype(f'datetime64[{self.unit}]')
+        return format_dates(seconds, self.format)
+
+
+def alias_table(weights):
+    # Vose's alias method: O(K) setup, after which a draw is one index plus one coin flip for any K
+    count = len(weights)
+    scaled = (weights * (count / weights.sum())).tolist()
+    probability = np.ones(count)
+    alias = np.arange(count)
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        less = small.pop()
+        more = large.pop()
+        probability[less] = scaled[less]
+        alias[less] = more
+        scaled[more] += scaled[less] - 1.0
+        (small if scaled[more] < 1.0 else large).append(more)
+    return probability, alias
+
+
+def load_weights(kwargs):
+    # weights as a list, or weights_file: a .npy array (memory-mapped) or text with one number per line
+    if kwargs.get('weights') is not None:
+        return np.asarray(kwargs['weights'], dtype=np.float64)
+    if kwargs.get('weights_file'):
+        if kwargs['weights_file'].endswith('.npy'):
+            return np.load(kwargs['weights_file'], mmap_mode='r').astype(np.float64)
+        return np.loadtxt(kwargs['weights_file'], dtype=np.float64, ndmin=1)
+    return None
+
+
+class LineFile:
+    # Values stored one per line in a UTF-8 text file. The file is memory-mapped and only the line
+    # offsets are kept in memory, so million-entry lists never become Python strings.
+    def __init__(self, filename):
+        self.filename = filename
+        size = os.path.getsize(filename)
+        self.buffer = np.memmap(filename, dtype=np.uint8, mode='r') if size else np.zeros(0, dtype=np.uint8)
+        newlines = np.flatnonzero(self.buffer == ord('\n'))
+        self.starts = np.concatenate([[0], newlines + 1])
+        self.ends = np.concatenate([newlines, [size]])
+        if self.starts[-1] == size:
+            # Trailing newline, not an extra empty value
+            self.starts = self.starts[:-1]
+            self.ends = self.ends[:-1]
+        carriage = self.ends > self.starts
+        carriage[carriage] = self.buffer[self.ends[carriage] - 1] == ord('\r')
+        self.ends = self.ends - carriage
+        self.ascii = not (self.buffer >= 0x80).any()
+
+    def __len__(self):
+        return len(self.starts)
+
+    def take(self, indices):
+        starts = self.starts[indices]
+        lengths = self.ends[indices] - starts
+        width = int(lengths.max()) if len(lengths) else 0
+        if width == 0:
+            return np.full(len(indices), '', dtype='U1')
+        columns = np.arange(width)
+        inside = columns < lengths[:, None]
+        codes = self.buffer[np.where(inside, starts[:, None] + columns, 0)]
+        codes[~inside] = 0
+        if self.ascii:
+            return strings_from_codes(codes)
+        return np.char.decode(codes.view(f'S{width}').reshape(len(indices)), 'utf-8')
+
+
+NATIVE_TYPES = {bool: np.bool_, int: np.int64, float: np.float64}
+
+
+class ChoiceSampler(ColumnSampler):
+    # Uniform choice takes one word per row; with weights an alias table adds a second word as the coin
+    draws = 1
+
+    def __init__(self, column, values, weights=None):
+        super().__init__(column)
+        if len(values) == 0:
+            raise ValueError(f"Column '{self.name}': no values to choose from")
+        if isinstance(values, LineFile):
+            self.values = values
+        elif all(isinstance(value, str) for value in values):
+            self.values = np.array(values)
+        elif len({type(value) for value in values}) == 1 and type(values[0]) in NATIVE_TYPES:
+            # Values of one non-string type keep a native dtype, so their batches take the vectorized paths
+            try:
+                self.values = np.array(values, dtype=NATIVE_TYPES[type(values[0])])
+            except OverflowError:
+                self.values = np.array(values, dtype=object)
+        else:
+            self.values = np.array(values, dtype=object)
+        if not isinstance(self.values, LineFile):
+            # Custom values of a single type keep it in databases, e.g. [1, 2, 3] loads as integers
+            inferred = np.asarray(self.values.tolist()).dtype.kind
+            self.kind = {'i': 'integer', 'u': 'integer', 'f': 'float', 'b': 'boolean'}.get(inferred, 'text')
+        self.alias = None
+        if weights is not None:
+            if len(weights) != len(values):
+                raise ValueError(f"Column '{self.name}': {len(weights)} weights for {len(values)} values")
+            if not np.isfinite(weights).all() or (weights < 0).any() or weights.sum() <= 0:
+                raise ValueError(f"Column '{self.name}': weights must be non-negative with a positive sum")
+            self.probability, self.alias = alias_table(weights)
+            self.draws = 2
+
+    def sample(self, words, row_start, raw=False):
+        indices = integers_from_words(words[:, 0], len(self.values))
+        if self.alias is not None:
+            keep = uniforms_from_words(words[:, 1]) < self.probability[indices]
+            indices = np.where(keep, indices, self.alias[indices])
+        return self.values.take(indices)
+
+
+class CustomSampler(ChoiceSampler):
+    def __init__(self, column):
+        kwargs = column['kwargs']
+        if kwargs.get('values_file'):
+            values = LineFile(kwargs['values_file'])
+        else:
+            values = list(kwargs.get('custom_values', []))
+        super().__init__(column, values, load_weights(kwargs))
+
+
+class CountrySampler(ChoiceSampler):
+    def __init__(self, column):
+        super().__init__(column, COUNTRIES, load_weights(column['kwargs']))
+
+
+class IdSampler(ColumnSampler):
+    kind = 'integer'
+
+    def sample(self, words, row_start, raw=False):
+        return np.arange(row_start, row_start + len(words))  # Unique ID is just the row index
+
+
+class PhoneSampler(ColumnSampler):
+    def __init__(self, column):
+        super().__init__(column)
+        kwargs = column['kwargs']
+        country_code = kwargs.get('country_code', '+1')
+        if not country_code.isascii():
+            raise ValueError(f"Column '{self.name}': country_code must be ASCII")
+        self.prefix = np.frombuffer(country_code.encode(), dtype=np.uint8)
+        self.length = int(kwargs.get('number_length', 10))
+        if self.length < 0:
+            raise ValueError(f"Column '{self.name}': number_length must not be negative")
+        self.draws = self.length
+        if self.unique:
+            self.unique_digits = unique_digit_count(10, self.length)
+            self.capacity = 10 ** self.unique_digits
+            self.draws = self.length - self.unique_digits
+
+    def bind(self, key):
+        super().bind(key)
+        if self.unique:
+            self.permutation = Permutation(10 ** self.unique_digits, key)
+
+    def sample(self, words, row_start, raw=False):
+        codes = np.empty((len(words), len(self.prefix) + self.length), dtype=np.uint8)
+        codes[:, :len(self.prefix)] = self.prefix
+        codes[:, len(self.prefix):len(self.prefix) + self.draws] = DIGITS[words % np.uint64(10)]
+        if self.unique:
+            digits = radix_digits(self.unique_rows(row_start, len(words)), 10, self.unique_digits)
+            codes[:, len(self.prefix) + self.draws:] = DIGITS[digits]
+        return strings_from_codes(codes)
+
+
+def fanout_cdf(fanout):
+    # Cumulative probabilities of a parent having 0, 1, 2, ... children
+    distribution = fanout.get('distribution', 'fixed')
+    if distribution == 'fixed':
+        count = int(fanout.get('count', 1))
+        if count < 0:
+            raise ValueError(f"fixed fan-out needs a non-negative count, got {count}")
+        probabilities = np.zeros(count + 1)
+        probabilities[-1] = 1
+    elif distribution == 'uniform':
+        low, high = int(fanout.get('min', 0)), int(fanout.get('max', 1))
+        if not 0 <= low <= high:
+            raise ValueError(f"uniform fan-out needs 0 <= min <= max, got {low} and {high}")
+        probabilities = (np.arange(high + 1) >= low).astype(float)
+    elif distribution == 'poisson':
+        mean = float(fanout.get('mean', 1))
+        if not 0 < mean <= 10_000:
+            raise ValueError(f"poisson fan-out needs 0 < mean <= 10000, got {mean}")
+        # The pmf is built in log space and cut off once the remaining tail is below double precision
+        counts = np.arange(int(mean + 40 * mean ** 0.5 + 40))
+        log_factorials = np.concatenate(([0.0], np.cumsum(np.log(counts[1:]))))
+        probabilities = np.exp(counts * np.log(mean) - mean - log_factorials)
+    elif distribution == 'weights':
+        probabilities = np.asarray(fanout.get('weights', []), dtype=float)
+        if len(probabilities) == 0 or not np.isfinite(probabilities).all() or (probabilities < 0).any() \
+                or probabilities.sum() <= 0:
+            raise ValueError("weights fan-out needs non-negative weights for 0, 1, 2, ... children")
+    else:
+        raise ValueError(f"unknown fan-out distribution {distribution!r}")
+    cdf = np.cumsum(probabilities)
+    return cdf / cdf[-1]
+
+
+@functools.lru_cache(maxsize=32)
+def fanout_offsets(spec, parent_rows, seed):
+    # First child row of every block of FANOUT_BLOCK parents; cached so that the one pass over the
+    # parent counts happens once per process rather than once per batch
+    fanout = Fanout(json.loads(spec), parent_rows, seed)
+    totals = [int(fanout.counts(start, min(FANOUT_BLOCK, parent_rows - start)).sum())
+              for start in range(0, parent_rows, FANOUT_BLOCK)]
+    return np.concatenate(([0], np.cumsum(totals, dtype=np.int64)))
+
+
+class Fanout:
+    # Children per parent row as a pure function of (seed, parent index), like any column value. Child
+    # rows are laid out grouped by parent, so any window of child rows maps back to its parents from
+    # per-block offsets alone, without holding parent rows or per-parent counts in memory.
+    def __init__(self, spec, parent_rows, seed):
+        self.spec = spec
+        self.parent_rows = parent_rows
+        self.seed = seed
+        self.cdf = fanout_cdf(spec)
+        # Counts that can only take one value (fixed, or uniform with min == max) need no random words
+        smallest = int(np.argmax(self.cdf > 0))
+        self.fixed = smallest if self.cdf[smallest] == 1 else None
+        self.key = np.random.SeedSequence(seed).generate_state(2, np.uint64)
+
+    def counts(self, start, count):
+        if self.fixed is not None:
+            return np.full(count, self.fixed, dtype=np.int64)
+        uniforms = uniforms_from_words(stream_words(self.key, 1, count, start)[:, 0])
+        return np.minimum(np.searchsorted(self.cdf, uniforms, side='right'), len(self.cdf) - 1)
+
+    @property
+    def offsets(self):
+        return fanout_offsets(json.dumps(self.spec, sort_keys=True), self.parent_rows, self.seed)
+
+    @property
+    def child_rows(self):
+        return int(self.offsets[-1])
+
+    def parents(self, row_start, num_rows):
+        # Parent row index of each child row in [row_start, row_start + num_rows)
+        offsets = self.offsets
+        if row_start + num_rows > offsets[-1]:
+            raise ValueError(f"Only {int(offsets[-1]):,} child rows exist, {row_start + num_rows:,} requested")
+        if num_rows == 0:
+            return np.empty(0, dtype=np.int64)
+        first = int(np.searchsorted(offsets, row_start, side='right')) - 1
+        last = int(np.searchsorted(offsets, row_start + num_rows - 1, side='right')) - 1
+        parent_start = first * FANOUT_BLOCK
+        parent_stop = min((last + 1) * FANOUT_BLOCK, self.parent_rows)
+        counts = self.counts(parent_start, parent_stop - parent_start)
+        parents = np.repeat(np.arange(parent_start, parent_stop), counts)
+        skip = row_start - int(offsets[first])
+        return parents[skip:skip + num_rows]
+
+
+class ReferenceSampler(ColumnSampler):
+    # Row indices of another table, i.e. values of its id column. With a fanout the rows are grouped by
+    # parent following the table's fan-out; otherwise each row picks a parent uniformly.
+    draws = 1
+    kind = 'integer'
+
+    def __init__(self, column):
+        super().__init__(column)
+        kwargs = column['kwargs']
+        self.rows = int(kwargs.get('rows', 0))
+        if self.rows <= 0:
+            raise ValueError(f"Column '{self.name}': references need the referenced table's rows")
+        self.fanout = None
+        if kwargs.get('fanout') is not None:
+            self.fanout = Fanout(kwargs['fanout'], self.rows, kwargs.get('fanout_seed', 0))
+            self.draws = 0
+
+    def sample(self, words, row_start, raw=False):
+        if self.fanout is not None:
+            return self.fanout.parents(row_start, len(words))
+        return integers_from_words(words[:, 0], self.rows)
+
+
+SAMPLERS = {
+    'string': StringSampler,
+    'numeric': NumericSampler,
+    'date': DateSampler,
+    'custom': CustomSampler,
+    'id': IdSampler,
+    'phone': PhoneSampler,
+    'country': CountrySampler,
+    'reference': ReferenceSampler,
+}
+
+
+# Types that accept unique=True; id columns are unique by construction
+UNIQUE_TYPES = {'string', 'phone', 'numeric', 'id'}
+
+
+def compile_column(column):
+    if column['data_type'] not in SAMPLERS:
+        raise ValueError(f"Column '{column['name']}': unknown data type {column['data_type']!r}")
+    if column['kwargs'].get('unique', False) and column['data_type'] not in UNIQUE_TYPES:
+        raise ValueError(f"Column '{column['name']}': {column['data_type']} columns do not support unique")
+    return SAMPLERS[column['data_type']](column)
+
+
+def string_codes(values):
+    width = values.dtype.itemsize // 4
+    return np.ascontiguousarray(values).view(np.uint32).reshape(len(values), width)
+
+
+def contains_any(values, characters):
+    # Rows of a str array that contain any of the given characters
+    if values.dtype.itemsize == 0 or len(values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    return np.isin(string_codes(values), [ord(c) for c in characters]).any(axis=1)
+
+
+def needs_escape(values, characters):
+    # Rows holding one of the given characters or anything outside printable ASCII
+    if values.dtype.itemsize == 0 or len(values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    codes = string_codes(values)
+    unsafe = (codes < 0x20) | (codes > 0x7e) | np.isin(codes, [ord(c) for c in characters])
+    unsafe &= np.arange(codes.shape[1]) < np.char.str_len(values)[:, None]
+    return unsafe.any(axis=1)
+
+
+def csv_field(value):
+    if value is None:
+        return ''
+    value = str(value)
+    if any(character in value for character in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def csv_line(fields):
+    # Like the csv module, a row of one empty field is written as "" so it is not read back as a blank line
+    if len(fields) == 1 and not fields[0]:
+        return '""\r\n'
+    return ','.join(fields) + '\r\n'
+
+
+def copy_field(value):
+    # PostgreSQL COPY text format: \N is NULL, backslash escapes tabs, line breaks and itself
+    if value is None:
+        return '\\N'
+    return str(value).translate(COPY_ESCAPES)
+
+
+def text_fields(values, style):
+    # Formats a whole column at once as CSV fields, JSON values, Python reprs or COPY text fields
+    # (style 'csv', 'json', 'repr', 'copy')
+    kind = values.dtype.kind
+    if kind in 'iu':
+        return list(map(str, values.tolist()))
+    if kind == 'b':
+        if style in ('json', 'copy'):
+            return np.where(values, 'true', 'false').tolist()
+        return list(map(str, values.tolist()))
+    if kind == 'f':
+        if style == 'json' and not np.isfinite(values).all():
+            return [json.dumps(value) for value in values.tolist()]
+        return list(map(repr, values.tolist()))
+    if kind == 'M':
+        return np.datetime_as_string(values).tolist()  # Raw dates; ISO 8601 is what COPY expects
+    if kind == 'U':
+        if style == 'csv':
+            fields = values.tolist()
+            for i in np.flatnonzero(contains_any(values, ',"\r\n')):
+                fields[i] = '"' + fields[i].replace('"', '""') + '"'
+            return fields
+        if style == 'copy':
+            fields = values.tolist()
+            for i in np.flatnonzero(contains_any(values, '\\\t\r\n')):
+                fields[i] = copy_field(fields[i])
+            return fields
+        quote, escape = ('"', json.dumps) if style == 'json' else ("'", repr)
+        fields = np.char.add(np.char.add(quote, values), quote).tolist()
+        for i in np.flatnonzero(needs_escape(values, quote + '\\')):
+            fields[i] = escape(str(values[i]))
+        return fields
+    # Object columns (mixed custom values, rows taken from self.data) go value by value
+    format_value = {'csv': csv_field, 'json': json.dumps, 'repr': repr, 'copy': copy_field}[style]
+    return [format_value(value) for value in values.tolist()]
+
+
+def row_template(names, style):
+    # '%s' placeholders for a dict-shaped row, e.g. '{"a": %s, "b": %s}'
+    key = json.dumps if style == 'json' else repr
+    return '{' + ', '.join(key(name).replace('%', '%%') + ': %s' for name in names) + '}'
+
+
+def copy_dates(values, sampler):
+    # Dates as COPY reads them: days for date columns, seconds for timestamp columns. Batches rebuilt from
+    # self.data hold display strings, which are parsed back first.
+    if values.dtype.kind != 'M':
+        seconds = [parse_date(value, sampler.format) for value in values.tolist()]
+        values = np.array(seconds, dtype=np.int64).astype('datetime64[s]')
+    return values.astype('datetime64[D]' if sampler.kind == 'date' else 'datetime64[s]')
+
+
+def binary_field(values, sampler):
+    # One column in COPY binary form: int64 byte lengths per row (-1 for NULL) and a (rows, width) uint8
+    # array whose rows start with those bytes. The wire type follows the sampler's kind, i.e. the column type
+    # create_table_sql declares, whatever dtype this batch happens to have.
+    kind = sampler.kind
+    if kind == 'text':
+        nulls = None
+        if values.dtype == object:
+            nulls = np.array([value is None for value in values.tolist()], dtype=bool)
+            values = np.where(nulls, '', values)
+        encoded = np.char.encode(values.astype(str), 'utf-8')
+        data = encoded.view(np.uint8).reshape(len(values), encoded.dtype.itemsize)
+        lengths = np.char.str_len(encoded).astype(np.int64)
+        if nulls is not None:
+            lengths[nulls] = -1
+        return lengths, data
+    if values.dtype == object:
+        values = np.asarray(values.tolist())
+    if kind in ('date', 'timestamp'):
+        values = copy_dates(values, sampler)
+    allowed = {'integer': 'iu', 'float': 'iuf', 'boolean': 'b', 'date': 'M', 'timestamp': 'M'}[kind]
+    if len(values) and values.dtype.kind not in allowed:
+        raise ValueError(f"Column '{sampler.name}': {values.dtype} values cannot be sent as {kind}")
+    if kind == 'boolean':
+        data = values.astype(np.uint8).reshape(len(values), 1)
+    elif kind == 'date':
+        # int4 days since 2000-01-01
+        days = (values - PG_EPOCH.astype('datetime64[D]')).astype(np.int64)
+        data = days.astype('>i4').view(np.uint8).reshape(len(values), 4)
+    elif kind == 'timestamp':
+        # int8 microseconds since 2000-01-01
+        microseconds = (values.astype('datetime64[us]') - PG_EPOCH).astype(np.int64)
+        data = microseconds.astype('>i8').view(np.uint8).reshape(len(values), 8)
+    else:
+        data = values.astype('>f8' if kind == 'float' else '>i8').view(np.uint8).reshape(len(values), 8)
+    return np.full(len(values), data.shape[1], dtype=np.int64), data
+
+
+def copy_binary(batch, samplers):
+    # Every row is an int16 field count followed by an int32 length and the bytes of each field; the fields
+    # are scattered into one buffer column by column
+    fields = [binary_field(values, sampler) for values, sampler in zip(batch.values(), samplers)]
+    num_rows = batch_rows(batch)
+    sizes = np.full(num_rows, 2, dtype=np.int64)
+    for lengths, _ in fields:
+        sizes += 4 + np.maximum(lengths, 0)
+    starts = np.cumsum(sizes) - sizes
+    buffer = np.empty(int(sizes.sum()), dtype=np.uint8)
+    buffer[starts[:, None] + np.arange(2)] = np.array([len(fields)], dtype='>i2').view(np.uint8)
+    positions = starts + 2
+    for lengths, data in fields:
+        buffer[positions[:, None] + np.arange(4)] = lengths.astype('>i4').view(np.uint8).reshape(num_rows, 4)
+        positions += 4
+        width = data.shape[1]
+        if (lengths == width).all():
+            buffer[positions[:, None] + np.arange(width)] = data
+        elif width:
+            used = np.arange(width) < lengths[:, None]
+            buffer[(positions[:, None] + np.arange(width))[used]] = data[used]
+        positions += np.maximum(lengths, 0)
+    return buffer.tobytes()
+
+
+def format_batch(batch, file_type, samplers=None):
+    # The COPY formats also need the compiled columns, to send values as their declared SQL types
+    if file_type == 'csv':
+        fields = [text_fields(values, 'csv') for values in batch.values()]
+        if len(fields) == 1:
+            return ''.join(map(csv_line, zip(*fields)))
+        return ''.join(','.join(row) + '\r\n' for row in zip(*fields))
+    if file_type == 'pgcopy':
+        fields = [text_fields(copy_dates(values, sampler) if sampler.kind in ('date', 'timestamp') else values,
+                              'copy')
+                  for values, sampler in zip(batch.values(), samplers)]
+        return ''.join('\t'.join(row) + '\n' for row in zip(*fields))
+    if file_type == 'pgbinary':
+        return copy_binary(batch, samplers)
+    style = 'repr' if file_type == 'txt' else 'json'
+    template = row_template(list(batch), style)
+    rows = map(template.__mod__, zip(*[text_fields(values, style) for values in batch.values()]))
+    if file_type == 'json':
+        return ', '.join(rows)
+    return ''.join(row + '\n' for row in rows)
+
+
+def block_compressor(compression):
+    if compression is None:
+        return None
+    if compression == 'gzip':
+        # Concatenated gzip members form a valid gzip file; mtime=0 keeps output reproducible
+        return functools.partial(gzip.compress, compresslevel=6, mtime=0)
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+        # Concatenated frames form a valid zstd stream; compressors are not shared between threads
+        return lambda data: zstandard.ZstdCompressor().compress(data)
+    raise ValueError(f'Unsupported compression {compression!r}')
+
+
+class BlockWriter:
+    # Collects text (or bytes) into large blocks and writes them in order. With compression every block is
+    # compressed independently on a thread pool, so formatting rather than zlib/zstd sets the pace.
+    # The filename '-' writes to standard output, e.g. to pipe a COPY stream into psql.
+    def __init__(self, filename, compression=None, threads=None, block_size=BLOCK_BYTES):
+        self.compress = block_compressor(compression)  # Rejects bad settings before the file is created
+        self.file = sys.stdout.buffer if filename == '-' else open(filename, 'wb')
+        self.threads = threads or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(self.threads) if self.compress else None
+        self.block_size = block_size
+        self.parts = []
+        self.size = 0
+        self.pending = deque()
+
+    def write(self, text):
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= self.block_size:
+            self.flush_block()
+
+    def flush_block(self):
+        if not self.parts:
+            return
+        if isinstance(self.parts[0], bytes):
+            data = b''.join(self.parts)
+        else:
+            data = ''.join(self.parts).encode('utf-8')
+        self.parts = []
+        self.size = 0
+        if self.executor is None:
+            self.file.write(data)
+            return
+        self.pending.append(self.executor.submit(self.compress, data))
+        while len(self.pending) > 2 * self.threads:
+            self.file.write(self.pending.popleft().result())
+
+    def close(self):
+        try:
+            self.flush_block()
+            while self.pending:
+                self.file.write(self.pending.popleft().result())
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+            if self.file is sys.stdout.buffer:
+                self.file.flush()
+            else:
+                self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def columnar_array(values):
+    # Batches rebuilt from self.data hold object arrays; let NumPy infer a proper dtype for them
+    if values.dtype == object:
+        values = np.asarray(values.tolist())
+        if values.dtype == object:
+            values = values.astype(str)
+    return values
+
+
+def write_columnar(directory, columns, batches, dtypes=None):
+    # One file per column: fixed-width arrays are written raw, strings as a UTF-8 buffer plus
+    # int64 offsets (num_rows + 1 entries), and schema.json describes how to map them back.
+    # dtypes fixes a column's dtype up front; where it is None the first batch decides.
+    os.makedirs(directory, exist_ok=True)
+    files = [open(os.path.join(directory, f'{index:03d}.values'), 'wb') for index in range(len(columns))]
+    offset_files = [None] * len(columns)
+    dtypes = list(dtypes) if dtypes is not None else [None] * len(columns)
+    positions = [0] * len(columns)
+    num_rows = 0
+    try:
+        for batch in batches:
+            for index, values in enumerate(batch.values()):
+                values = columnar_array(values)
+                if dtypes[index] is None:
+                    dtypes[index] = 'string' if values.dtype.kind in 'USO' else values.dtype.str
+                if dtypes[index] == 'string' and offset_files[index] is None:
+                    offset_files[index] = open(os.path.join(directory, f'{index:03d}.offsets'), 'wb')
+                    np.zeros(1, dtype=np.int64).tofile(offset_files[index])
+                if dtypes[index] != 'string':
+                    if not np.can_cast(values.dtype, dtypes[index], 'same_kind'):
+                        raise ValueError(f"Column '{columns[index]['name']}': {values.dtype} values do not fit "
+                                         f"the column's {np.dtype(dtypes[index])} dtype")
+                    values.astype(dtypes[index], copy=False).tofile(files[index])
+                    continue
+                encoded = np.char.encode(values.astype(str), 'utf-8')
+                lengths = np.char.str_len(encoded)
+                width = encoded.dtype.itemsize
+                if width:
+                    codes = encoded.view(np.uint8).reshape(len(encoded), width)
+                    codes[np.arange(width) < lengths[:, None]].tofile(files[index])
+                (positions[index] + np.cumsum(lengths, dtype=np.int64)).tofile(offset_files[index])
+                positions[index] += int(lengths.sum())
+            num_rows += batch_rows(batch)
+    finally:
+        for f in files + offset_files:
+            if f is not None:
+                f.close()
+
+    manifest = {'num_rows': num_rows, 'columns': []}
+    for index, column in enumerate(columns):
+        if dtypes[index] is None:
+            dtypes[index] = 'string'
+        if dtypes[index] == 'string' and offset_files[index] is None:
+            np.zeros(1, dtype=np.int64).tofile(os.path.join(directory, f'{index:03d}.offsets'))
+        manifest['columns'].append({'name': column['name'], 'data_type': column['data_type'],
+                                    'value_type': column['value_type'], 'kwargs': column['kwargs'],
+                                    'dtype': dtypes[index], 'values': f'{index:03d}.values',
+                                    'offsets': f'{index:03d}.offsets' if dtypes[index] == 'string' else None})
+    with open(os.path.join(directory, 'schema.json'), 'w') as schema_file:
+        json.dump(manifest, schema_file, indent=2, default=str)
+
+
+def quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def create_table_statement(table, columns):
+    # columns is a list of (name, SQL type) pairs
+    definitions = ', '.join(f'{quote_identifier(name)} {sql_type}' for name, sql_type in columns)
+    return f'CREATE TABLE {quote_identifier(table)} ({definitions})'
+
+
+def default_table(filename):
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+def drop_sqlite_table(filename, table):
+    import sqlite3
+
+    if not os.path.exists(filename):
+        return
+    connection = sqlite3.connect(filename, isolation_level=None)
+    try:
+        connection.execute(f'DROP TABLE IF EXISTS {quote_identifier(table)}')
+    finally:
+        connection.close()
+
+
+def write_sqlite(filename, table, columns, batches):
+    # Replaces the table, keeping any other tables in the database, and inserts every batch with executemany.
+    # Rows are committed every SQLITE_TRANSACTION_ROWS, so a cancelled or failed run keeps what was committed.
+    import sqlite3  # Only database outputs pay for importing sqlite3
+
+    connection = sqlite3.connect(filename, isolation_level=None)
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            connection.execute(pragma)
+        insert = f"INSERT INTO {quote_identifier(table)} VALUES ({', '.join('?' * len(columns))})"
+        connection.execute('BEGIN')
+        connection.execute(f'DROP TABLE IF EXISTS {quote_identifier(table)}')
+        connection.execute(create_table_statement(table, columns))
+        pending = 0
+        for batch in batches:
+            connection.executemany(insert, zip(*[values.tolist() for values in batch.values()]))
+            pending += batch_rows(batch)
+            if pending >= SQLITE_TRANSACTION_ROWS:
+                connection.execute('COMMIT')
+                connection.execute('BEGIN')
+                pending = 0
+        connection.execute('COMMIT')
+    finally:
+        connection.close()  # Rolls back an open transaction
+
+
+def map_file(filename, dtype, count):
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(filename, dtype=dtype, mode='r', shape=(count,))
+
+
+class StringColumn:
+    # Lazily decoded view over a string column's offsets and UTF-8 buffer
+    def __init__(self, offsets, buffer):
+        self.offsets = offsets
+        self.buffer = buffer
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return bytes(self.buffer[self.offsets[index]:self.offsets[index + 1]]).decode('utf-8')
+
+    def to_numpy(self):
+        lengths = np.diff(self.offsets)
+        width = int(lengths.max()) if len(lengths) else 0
+        if width == 0:
+            return np.full(len(self), '', dtype='U1')
+        codes = np.zeros((len(self), width), dtype=np.uint8)
+        codes[np.arange(width) < lengths[:, None]] = self.buffer
+        return np.char.decode(codes.view(f'S{width}').reshape(len(self)), 'utf-8')
+
+
+class ColumnarDataset:
+    # Columns are opened on first access; fixed-width ones are np.memmap arrays over the column file
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'schema.json')) as schema_file:
+            manifest = json.load(schema_file)
+        self.num_rows = manifest['num_rows']
+        self.columns = manifest['columns']
+        self.names = [column['name'] for column in self.columns]
+        self.opened = {}
+
+    def __len__(self):
+        return self.num_rows
+
+    def __getitem__(self, name):
+        if name not in self.opened:
+            column = self.columns[self.names.index(name)]
+            values = os.path.join(self.directory, column['values'])
+            if column['dtype'] == 'string':
+                offsets = map_file(os.path.join(self.directory, column['offsets']), np.int64, self.num_rows + 1)
+                self.opened[name] = StringColumn(offsets, map_file(values, np.uint8, int(offsets[-1])))
+            else:
+                self.opened[name] = map_file(values, np.dtype(column['dtype']), self.num_rows)
+        return self.opened[name]
+
+
+def load_columnar(directory):
+    return ColumnarDataset(directory)
+
+
+def peak_rss():
+    # Peak resident set size of this process in bytes, or None where the resource module is missing
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # Linux reports KiB
+
+
+def output_size(filename):
+    if filename == '-':
+        return 0  # Standard output
+    if os.path.isdir(filename):
+        return sum(entry.stat().st_size for entry in os.scandir(filename))
+    return os.path.getsize(filename)
+
+
+class GenerationStats:
+    # Totals collected while instrumentation is on; times are wall-clock seconds
+    def __init__(self):
+        self.column_seconds = {}
+        self.batches = 0
+        self.rows = 0
+        self.batch_seconds = 0.0
+        self.stage_seconds = {}
+        self.bytes_written = 0
+        self.peak_memory_bytes = None
+
+    def update(self, event, data):
+        if event == 'column':
+            self.column_seconds[data['name']] = self.column_seconds.get(data['name'], 0.0) + data['seconds']
+            return
+        if event == 'batch':
+            self.batches += 1
+            self.rows += data['rows']
+            self.batch_seconds += data['seconds']
+        elif event == 'stage':
+            self.stage_seconds[data['stage']] = self.stage_seconds.get(data['stage'], 0.0) + data['seconds']
+        elif event == 'output':
+            self.bytes_written += data['bytes']
+        peak = peak_rss()
+        if peak is not None:
+            self.peak_memory_bytes = max(peak, self.peak_memory_bytes or 0)
+
+    def as_dict(self):
+        return {'column_seconds': dict(self.column_seconds), 'batches': self.batches, 'rows': self.rows,
+                'batch_seconds': self.batch_seconds, 'stage_seconds': dict(self.stage_seconds),
+                'bytes_written': self.bytes_written, 'peak_memory_bytes': self.peak_memory_bytes}
+
+
+class Stage:
+    # with generator.stage(name): reports the block's wall time, and costs one attribute check when
+    # instrumentation is off
+    __slots__ = ('generator', 'name', 'started')
+
+    def __init__(self, generator, name):
+        self.generator = generator
+        self.name = name
+        self.started = None
+
+    def __enter__(self):
+        if self.generator.instrumented:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.started is not None:
+            self.generator.record('stage', stage=self.name, seconds=time.perf_counter() - self.started)
+
+
+def shard_spec(columns, seed):
+    # What a worker needs to rebuild a generator, pickled once per run by the parent process
+    return pickle.dumps((columns, seed))
+
+
+@functools.lru_cache(maxsize=8)
+def shard_generator(spec):
+    # Compiled once per worker process and spec, so lookup tables, alias tables and value files are built
+    # once per worker rather than once per batch
+    columns, seed = pickle.loads(spec)
+    generator = RandomDataGenerator(seed)
+    generator.columns = columns
+    generator.compile()
+    return generator
+
+
+def generate_shard(spec, num_rows, start, raw=False):
+    return shard_generator(spec).generate_columns(num_rows, start, raw)
+
+
+def save_shard(spec, filename, file_type, num_rows, start, batch_size, compression=None, table=None):
+    generator = shard_generator(spec)
+    batches = generator.iter_batches(num_rows, batch_size, start, raw=file_type in RAW_FILE_TYPES)
+    generator.write_batches(filename, file_type, batches, compression, table)
+    return filename
+
+
+class RandomDataGenerator:
+    def __init__(self, seed=None):
+        self.columns = []
+        self.data = []
+        # Values are a pure function of (seed, column position, row index), so output does not depend
+        # on how the row range is split into batches or across workers
+        self.seed = np.random.SeedSequence().entropy if seed is None else seed
+        self.samplers = []
+        # Instrumentation: off unless enable_stats or add_hook is called
+        self.stats = None
+        self.hooks = []
+        self.instrumented = False
+
+    def enable_stats(self):
+        self.stats = GenerationStats()
+        self.instrumented = True
+        return self.stats
+
+    def add_hook(self, hook):
+        # hook(event, data) is called on the calling thread for every 'column', 'batch', 'stage' and
+        # 'output' event, e.g. to forward timings to a metrics system
+        self.hooks.append(hook)
+        self.instrumented = True
+
+    def disable_stats(self):
+        self.stats = None
+        self.hooks = []
+        self.instrumented = False
+
+    def record(self, event, **data):
+        if self.stats is not None:
+            self.stats.update(event, data)
+        for hook in self.hooks:
+            hook(event, data)
+
+    def stage(self, name):
+        return Stage(self, name)
+
+    def consumed(self, stage, batches):
+        # Reports the time a writer spends on each batch before asking for the next one
+        for batch in batches:
+            started = time.perf_counter()
+            yield batch
+            self.record('stage', stage=stage, seconds=time.perf_counter() - started)
+
+    def add_column(self, name, data_type, value_type, **kwargs):
+        if data_type == 'date':
+            # 'now' becomes a fixed timestamp here: workers recompile the column from its kwargs, and every
+            # batch of a run has to share the same bound
+            for key, default in (('start_date', '1970-01-01'), ('end_date', 'now')):
+                if kwargs.get(key, default) == 'now':
+                    kwargs[key] = parse_date('now', None)
+        column = {'name': name, 'data_type': data_type, 'value_type': value_type, 'kwargs': kwargs}
+        sampler = compile_column(column)  # Bad kwargs fail here rather than mid-run
+        sampler.bind(self.column_key(len(self.columns)))
+        self.columns.append(column)
+        self.samplers.append(sampler)
+
+    def compile(self):
+        # Samplers are rebuilt only when self.columns no longer holds the columns they were built from
+        if len(self.samplers) != len(self.columns) or any(
+                sampler.column is not column for sampler, column in zip(self.samplers, self.columns)):
+            self.samplers = [compile_column(column) for column in self.columns]
+            for index, sampler in enumerate(self.samplers):
+                sampler.bind(self.column_key(index))
+        return self.samplers
+
+    def check_capacity(self, stop):
+        # unique=True columns cannot produce more distinct values than their value space holds
+        for sampler in self.compile():
+            if sampler.unique and sampler.capacity is not None and stop > sampler.capacity:
+                raise ValueError(f"Column '{sampler.name}' is unique but only has {sampler.capacity:,} "
+                                 f"possible values, {stop:,} rows requested")
+
+    def column_key(self, column_index):
+        return np.random.SeedSequence(self.seed, spawn_key=(column_index,)).generate_state(2, np.uint64)
+
+    def column_words(self, sampler, num_rows, start):
+        # Keyed by (seed, column), so any row window is drawn without touching the rows before it
+        return stream_words(sampler.key, sampler.draws, num_rows, start)
+
+    def generate_columns(self, num_rows, start=0, raw=False):
+        self.check_capacity(start + num_rows)
+        if not self.instrumented:
+            return {sampler.name: sampler.sample(self.column_words(sampler, num_rows, start), start, raw)
+                    for sampler in self.compile()}
+        columns = {}
+        for sampler in self.compile():
+            started = time.perf_counter()
+            columns[sampler.name] = sampler.sample(self.column_words(sampler, num_rows, start), start, raw)
+            self.record('column', name=sampler.name, rows=num_rows, seconds=time.perf_counter() - started)
+        return columns
+
+    def generate_range(self, start, stop):
+        # Rows [start, stop) exactly as generate_data(stop) would produce them, in O(stop - start)
+        return rows_from_columns(self.generate_columns(stop - start, start), stop - start)
+
+    def iter_batches(self, num_rows, batch_size=BATCH_SIZE, start=0, workers=None, raw=False):
+        # Yields {name: array} batches of at most batch_size rows without keeping earlier ones
+        ranges = [(min(batch_size, start + num_rows - offset), offset)
+                  for offset in range(start, start + num_rows, batch_size)]
+        if not workers or workers == 1:
+            for count, offset in ranges:
+                started = time.perf_counter()
+                batch = self.generate_columns(count, offset, raw)
+                if self.instrumented:
+                    self.record('batch', start=offset, rows=count, seconds=time.perf_counter() - started)
+                yield batch
+            return
+        spec = shard_spec(self.columns, self.seed)
+        with ProcessPoolExecutor(workers) as executor:
+            pending = deque()
+            for count, offset in ranges:
+                pending.append((offset, count, executor.submit(generate_shard, spec, count, offset, raw)))
+                if len(pending) >= 2 * workers:
+                    yield self.collect_batch(*pending.popleft())
+            while pending:
+                yield self.collect_batch(*pending.popleft())
+
+    def collect_batch(self, offset, count, future):
+        # With workers the batch time is how long the writer waited for it, not the worker's own time
+        started = time.perf_counter()
+        batch = future.result()
+        if self.instrumented:
+            self.record('batch', start=offset, rows=count, seconds=time.perf_counter() - started)
+        return batch
+
+    def iter_data_batches(self, batch_size=BATCH_SIZE):
+        # Same batch shape as iter_batches, built from the rows already in self.data
+        names = [col['name'] for col in self.columns]
+        for start in range(0, len(self.data), batch_size):
+            rows = self.data[start:start + batch_size]
+            yield {name: np.array([row[name] for row in rows], dtype=object) for name in names}
+
+    def generate_data(self, num_rows):
+        self.data = rows_from_columns(self.generate_columns(num_rows), num_rows)
+        return self.data
+
+    def save_to_file(self, filename, file_type, num_rows=None, batch_size=BATCH_SIZE, workers=None,
+                     compression=None, progress=None, cancel=None, table=None):
+        # With num_rows the data is generated and written batch by batch instead of taken from self.data.
+        # progress(rows_done) is called after each batch; setting cancel stops after the current one.
+        # table names the SQLite table, by default the file name without its extension.
+        if num_rows is None:
+            batches = self.iter_data_batches(batch_size)
+        else:
+            self.check_capacity(num_rows)
+            batches = self.iter_batches(num_rows, batch_size, workers=workers, raw=file_type in RAW_FILE_TYPES)
+        self.write_batches(filename, file_type, track_batches(batches, progress, cancel), compression, table)
+
+    def save_shards(self, filename, file_type, num_rows, shard_rows=SHARD_ROWS, batch_size=BATCH_SIZE, workers=None,
+                    compression=None, table=None):
+        # Each worker generates and writes its own name-00000.ext file; returns the file names in row order
+        self.check_capacity(num_rows)
+        base, extension = os.path.splitext(filename)
+        table = table or os.path.basename(base)  # Every shard gets the same table name
+        jobs = [(f'{base}-{index:05d}{extension}', min(shard_rows, num_rows - start), start)
+                for index, start in enumerate(range(0, num_rows, shard_rows))]
+        spec = shard_spec(self.columns, self.seed)
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [executor.submit(save_shard, spec, shard_name, file_type, count, start, batch_size, compression,
+                                       table) for shard_name, count, start in jobs]
+            return [future.result() for future in futures]
+
+    def sql_columns(self, dialect):
+        return [(sampler.name, SQL_TYPES[dialect][sampler.kind]) for sampler in self.compile()]
+
+    def create_table_sql(self, table, dialect='postgres'):
+        # The table a pgcopy or pgbinary stream loads into; binary COPY needs exactly these column types
+        return create_table_statement(table, self.sql_columns(dialect))
+
+    def copy_sql(self, table, binary=False):
+        # e.g. python main.py ... --format pgcopy --output - | psql -c "<this statement>"
+        names = ', '.join(quote_identifier(col['name']) for col in self.columns)
+        return f"COPY {quote_identifier(table)} ({names}) FROM STDIN" + (' WITH (FORMAT binary)' if binary else '')
+
+    def write_batches(self, filename, file_type, batches, compression=None, table=None):
+        fieldnames = [col['name'] for col in self.columns]
+        if compression is not None and file_type not in STREAM_FILE_TYPES:
+            raise ValueError(f'Compression is not supported for {file_type} files')
+
+        if file_type in STREAM_FILE_TYPES:
+            samplers = self.compile()
+            writer = BlockWriter(filename, compression)
+            try:
+                if file_type == 'csv':
+                    writer.write(csv_line([csv_field(name) for name in fieldnames]))
+                elif file_type == 'json':
+                    writer.write('[')
+                elif file_type == 'pgbinary':
+                    writer.write(PGCOPY_HEADER)
+                separator = ''
+                for batch in batches:
+                    with self.stage('format'):
+                        text = format_batch(batch, file_type, samplers)
+                    if file_type == 'json' and text:
+                        text = separator + text
+                        separator = ', '
+                    with self.stage('write'):
+                        writer.write(text)
+                if file_type == 'json':
+                    writer.write(']')
+                elif file_type == 'pgbinary':
+                    writer.write(PGCOPY_TRAILER)
+            finally:
+                with self.stage('write'):
+                    writer.close()
+        elif file_type == 'xlsx':
+            # Write-only workbooks stream rows to disk instead of keeping cell objects around
+            from openpyxl import Workbook  # Only xlsx exports pay for importing openpyxl
+
+            wb = Workbook(write_only=True)
+            ws = None
+            room = 0
+            for batch in batches:
+                with self.stage('xlsx'):
+                    for row in rows_from_batch(batch):
+                        if room == 0:
+                            ws = wb.create_sheet(f'Sheet{len(wb.worksheets) + 1}' if wb.worksheets else 'Sheet')
+                            ws.append(fieldnames)
+                            room = EXCEL_MAX_ROWS - 1
+                        ws.append(row)
+                        room -= 1
+            if ws is None:
+                wb.create_sheet('Sheet').append(fieldnames)
+            with self.stage('write'):
+                wb.save(filename)
+        elif file_type == 'columnar':
+            if self.instrumented:
+                batches = self.consumed('columnar', batches)
+            dtypes = [COLUMNAR_DTYPES.get(sampler.kind) for sampler in self.compile()]
+            write_columnar(filename, self.columns, batches, dtypes)
+        elif file_type == 'sqlite':
+            if self.instrumented:
+                batches = self.consumed('sqlite', batches)
+            table = table or default_table(filename)
+            write_sqlite(filename, table, self.sql_columns('sqlite'), batches)
+        else:
+            # Handle unsupported file types
+            return
+        if self.instrumented:
+            self.record('output', filename=filename, bytes=output_size(filename))
+
+
+class RelationalGenerator:
+    # Tables whose reference columns point at another table's id column, i.e. its row index. Each table has
+    # its own seed derived from this one and its position, and a reference only needs the referenced
+    # table's row count, so every table can be generated, streamed or saved on its own and in parallel.
+    def __init__(self, seed=None):
+        self.seed = np.random.SeedSequence().entropy if seed is None else seed
+        self.tables = {}
+        self.rows = {}
+        self.fanouts = {}  # Child table name -> (parent table name, Fanout)
+
+    def table_seed(self, index, stream):
+        words = np.random.SeedSequence(self.seed, spawn_key=(index, stream)).generate_state(2, np.uint64)
+        return int(words[0]) << 64 | int(words[1])
+
+    def add_table(self, name, rows=None, parent=None, fanout=None):
+        # Either a number of rows, or a parent and a fan-out such as {'distribution': 'poisson', 'mean': 3}
+        # (also 'fixed' with count, 'uniform' with min and max, 'weights' for 0, 1, 2, ... children);
+        # a child's row count then follows from its parent's
+        if name in self.tables:
+            raise ValueError(f"Table '{name}' already exists")
+        if (rows is None) == (parent is None):
+            raise ValueError(f"Table '{name}' needs either rows or a parent")
+        index = len(self.tables)
+        if parent is not None:
+            if parent not in self.tables:
+                raise ValueError(f"Table '{name}': unknown parent table {parent!r}")
+            fanout = Fanout(dict(fanout or {'distribution': 'fixed', 'count': 1}), self.rows[parent],
+                            self.table_seed(index, 1))
+            self.fanouts[name] = (parent, fanout)
+            rows = fanout.child_rows
+        generator = RandomDataGenerator(self.table_seed(index, 0))
+        self.tables[name] = generator
+        self.rows[name] = int(rows)
+        return generator
+
+    def add_column(self, table, name, data_type, value_type, **kwargs):
+        # A reference column names its table with references=; the column to the table's own parent follows
+        # the fan-out, references to any other table pick one of its rows uniformly
+        if data_type == 'reference':
+            target = kwargs.get('references')
+            if target not in self.tables:
+                raise ValueError(f"Column '{name}': unknown table {target!r}")
+            kwargs['rows'] = self.rows[target]
+            parent, fanout = self.fanouts.get(table, (None, None))
+            if target == parent:
+                kwargs['fanout'] = fanout.spec
+                kwargs['fanout_seed'] = fanout.seed
+        self.tables[table].add_column(name, data_type, value_type, **kwargs)
+
+    def iter_batches(self, table, batch_size=BATCH_SIZE, workers=None, raw=False):
+        return self.tables[table].iter_batches(self.rows[table], batch_size, workers=workers, raw=raw)
+
+    def save_tables(self, directory, file_type, batch_size=BATCH_SIZE, workers=None, compression=None):
+        # Writes directory/<table>.<file_type> for every table and returns {table: filename}; with
+        # workers each table is generated and written by its own process
+        os.makedirs(directory, exist_ok=True)
+        suffix = {None: '', **{name: extension for extension, name in COMPRESSION_EXTENSIONS.items()}}[compression]
+        filenames = {name: os.path.join(directory, f'{name}.{file_type}{suffix}') for name in self.tables}
+        for name, generator in self.tables.items():
+            generator.check_capacity(self.rows[name])
+        if not workers or workers == 1:
+            for name, generator in self.tables.items():
+                generator.save_to_file(filenames[name], file_type, num_rows=self.rows[name], batch_size=batch_size,
+                                       compression=compression)
+            return filenames
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [executor.submit(save_shard, shard_spec(generator.columns, generator.seed), filenames[name],
+                                       file_type, self.rows[name], 0, batch_size, compression)
+                       for name, generator in self.tables.items()]
+            for future in futures:
+                future.result()
+        return filenames
+
+
+def remove_output(filename, file_type=None, table=None):
+    # Columnar datasets are directories, every other file type is a single file. A SQLite database can hold
+    # other tables, so for sqlite only the generated table is dropped and the file is kept.
+    if file_type == 'sqlite':
+        drop_sqlite_table(filename, table or default_table(filename))
+    elif os.path.isdir(filename):
+        shutil.rmtree(filename)
+    elif os.path.exists(filename):
+        os.remove(filename)
+
+
+def parse_columns(schema):
+    # A list of columns shaped like RandomDataGenerator.columns; options may be nested under "kwargs" or inline
+    columns = []
+    for entry in schema:
+        entry = dict(entry)
+        kwargs = dict(entry.pop('kwargs', None) or {})
+        name = entry.pop('name')
+        data_type = entry.pop('data_type')
+        value_type = entry.pop('value_type', 'random')
+        for key in ('dtype', 'values', 'offsets'):
+            entry.pop(key, None)  # Storage details of a columnar manifest
+        kwargs.update(entry)
+        columns.append((name, data_type, value_type, kwargs))
+    return columns
+
+
+def load_schema(filename):
+    # A list of columns, or an object with a "columns" list (so a columnar dataset's schema.json can be
+    # reused), or an object with a "tables" list for load_tables
+    with open(filename) as schema_file:
+        schema = json.load(schema_file)
+    if isinstance(schema, dict):
+        if 'tables' in schema:
+            return load_tables(schema)
+        schema = schema['columns']
+    return parse_columns(schema)
+
+
+def load_tables(schema):
+    # [{"name": ..., "rows": ... or "parent": ... with an optional "fanout", "columns": [...]}, ...]
+    tables = []
+    for table in schema['tables']:
+        tables.append({'name': table['name'], 'rows': table.get('rows'), 'parent': table.get('parent'),
+                       'fanout': table.get('fanout'), 'columns': parse_columns(table['columns'])})
+    return {'tables': tables}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Generate random data without the GUI. "
+                                                 "Run without arguments to open the GUI instead.")
+    parser.add_argument('--schema', required=True, help="JSON file describing the columns")
+    parser.add_argument('--rows', type=int, help="number of rows to generate (multi-table schemas set their own)")
+    parser.add_argument('--output', required=True,
+                        help="output file (a directory for columnar output and for multi-table schemas, "
+                             "- for standard output)")
+    parser.add_argument('--format', choices=sorted(OUTPUT_FILE_TYPES),
+                        help="output format, taken from the output extension when omitted")
+    parser.add_argument('--seed', type=int, help="seed for reproducible output")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--workers', type=int, help="processes used to generate batches")
+    parser.add_argument('--shard-rows', type=int,
+                        help="write one file per this many rows, each generated and written by a worker")
+    parser.add_argument('--compression', choices=sorted(COMPRESSION_EXTENSIONS.values()),
+                        help="taken from a .gz or .zst output extension when omitted")
+    parser.add_argument('--table', help="table name for sqlite output, the output file name by default")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        import gui  # tkinter is only imported when the GUI is actually opened
+
+        gui.run()
+        return
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        schema = load_schema(args.schema)
+    except (OSError, KeyError, TypeError, ValueError) as e:
+        parser.error(f"invalid schema {args.schema!r}: {e}")
+    if isinstance(schema, dict):
+        save_relational(parser, args, schema['tables'])
+        return
+
+    file_type = args.format
+    if args.rows is None:
+        parser.error("--rows is required unless the schema lists tables")
+    base, extension = os.path.splitext(args.output)
+    if extension.lower() in COMPRESSION_EXTENSIONS:
+        args.compression = args.compression or COMPRESSION_EXTENSIONS[extension.lower()]
+        extension = os.path.splitext(base)[1]
+    if file_type is None:
+        file_type = extension.lstrip('.').lower()
+        if file_type not in OUTPUT_FILE_TYPES:
+            parser.error(f"cannot tell the format from {args.output!r}, pass --format")
+
+    generator = RandomDataGenerator(args.seed)
+    try:
+        for name, data_type, value_type, kwargs in schema:
+            generator.add_column(name, data_type, value_type, **kwargs)
+    except (KeyError, TypeError, ValueError) as e:
+        parser.error(f"invalid schema {args.schema!r}: {e}")
+
+    try:
+        if args.shard_rows:
+            generator.save_shards(args.output, file_type, args.rows, shard_rows=args.shard_rows,
+                                  batch_size=args.batch_size, workers=args.workers, compression=args.compression,
+                                  table=args.table)
+        else:
+            generator.save_to_file(args.output, file_type, num_rows=args.rows, batch_size=args.batch_size,
+                                   workers=args.workers, compression=args.compression, table=args.table)
+    except ValueError as e:
+        parser.error(str(e))  # e.g. compression for a format that has none, or too many rows for a unique column
+
+
+def save_relational(parser, args, tables):
+    # Multi-table schemas write one file per table into the --output directory, in --format (csv by default)
+    if args.rows is not None or args.shard_rows:
+        parser.error("--rows and --shard-rows do not apply when the schema lists tables")
+    generator = RelationalGenerator(args.seed)
+    try:
+        for table in tables:
+            generator.add_table(table['name'], table['rows'], table['parent'], table['fanout'])
+            for name, data_type, value_type, kwargs in table['columns']:
+                generator.add_column(table['name'], name, data_type, value_type, **kwargs)
+    except (KeyError, TypeError, ValueError) as e:
+        parser.error(f"invalid schema {args.schema!r}: {e}")
+    try:
+        generator.save_tables(args.output, args.format or 'csv', batch_size=args.batch_size, workers=args.workers,
+                              compression=args.compression)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+def __getattr__(name):
+    # The Tk classes moved to gui.py so that headless use never imports tkinter
+    if name in ('RandomDataGeneratorApp', 'PreviewTable'):
+        import gui
+
+        return getattr(gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if __name__ == "__main__":
+    main()
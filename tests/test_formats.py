@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import RandomDataGenerator  # noqa: E402
+
+
+def build_generator():
+    generator = RandomDataGenerator(3)
+    generator.add_column('id', 'id', 'random')
+    generator.add_column('text', 'string', 'random', length=6, include_numbers=True, include_special=True)
+    generator.add_column('number', 'numeric', 'random', start=-50, end=50)
+    generator.add_column('normal', 'numeric', 'random', distribution='normal', mean=5, stddev=2)
+    generator.add_column('date', 'date', 'random', end_date='2020-01-01')
+    generator.add_column('phone', 'phone', 'random')
+    generator.add_column('country', 'country', 'random')
+    generator.add_column('custom', 'custom', 'random',
+                         custom_values=['plain', 'a,b', 'say "hi"', 'two\nlines', 'ünïcode', "it's", 'back\\slash', ''])
+    generator.add_column('mixed', 'custom', 'random', custom_values=[1, 2.5, None, 'x', True])
+    return generator
+
+
+# What save_to_file wrote before it streamed batches, from rows in self.data
+def reference_output(rows, fieldnames, file_type):
+    if file_type == 'csv':
+        output = io.StringIO(newline='')
+        writer = csv.DictWriter(output, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+        return output.getvalue()
+    if file_type == 'json':
+        return json.dumps(rows)
+    if file_type == 'jsonl':
+        return ''.join(json.dumps(row) + '\n' for row in rows)
+    return ''.join(str(row) + '\n' for row in rows)
+
+
+def read_output(filename):
+    with open(filename, newline='', encoding='utf-8') as output_file:
+        return output_file.read()
+
+
+@pytest.mark.parametrize('file_type', ['csv', 'json', 'jsonl', 'txt'])
+def test_text_formats_match_the_reference_writers(tmp_path, file_type):
+    generator = build_generator()
+    rows = generator.generate_data(2000)
+    expected = reference_output(rows, [column['name'] for column in generator.columns], file_type)
+
+    generator.save_to_file(tmp_path / 'from_data', file_type, batch_size=300)
+    generator.save_to_file(tmp_path / 'streamed', file_type, num_rows=2000, batch_size=300)
+    assert read_output(tmp_path / 'from_data') == expected
+    assert read_output(tmp_path / 'streamed') == expected
+
+
+@pytest.mark.parametrize('custom_values', [['', 'x'], [None, 'x']])
+def test_single_column_csv_quotes_empty_fields(tmp_path, custom_values):
+    generator = RandomDataGenerator(1)
+    generator.add_column('c', 'custom', 'random', custom_values=custom_values)
+    rows = generator.generate_data(50)
+    generator.save_to_file(tmp_path / 'data.csv', 'csv', num_rows=50, batch_size=7)
+
+    assert read_output(tmp_path / 'data.csv') == reference_output(rows, ['c'], 'csv')
+    with open(tmp_path / 'data.csv', newline='') as csv_file:
+        assert len(list(csv.DictReader(csv_file))) == 50
+
+
+@pytest.mark.parametrize('date_format, start_date, end_date, sql_type', [
+    ('%Y-%m-%d', '1970-01-01', '2020-01-01', 'date'),
+    ('%Y-%m-%d %H:%M', '1970-01-01 00:00', '2020-01-01 00:00', 'timestamp'),
+])
+def test_copy_dates_match_csv_dates(tmp_path, date_format, start_date, end_date, sql_type):
+    # The same seed must load the same dates whichever output is used
+    generator = RandomDataGenerator(4)
+    generator.add_column('d', 'date', 'random',
+                         start_date=start_date, end_date=end_date, format=date_format)
+    assert generator.create_table_sql('t') == f'CREATE TABLE "t" ("d" {sql_type})'
+    generator.save_to_file(tmp_path / 'data.csv', 'csv', num_rows=200, batch_size=64)
+    generator.save_to_file(tmp_path / 'data.pgcopy', 'pgcopy', num_rows=200, batch_size=64)
+
+    with open(tmp_path / 'data.csv', newline='') as csv_file:
+        csv_dates = [datetime.strptime(row['d'], date_format) for row in csv.DictReader(csv_file)]
+    copy_dates = [datetime.fromisoformat(line) for line in read_output(tmp_path / 'data.pgcopy').splitlines()]
+    assert copy_dates == csv_dates
@@ -0,0 +1,59 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import FANOUT_BLOCK, RelationalGenerator  # noqa: E402
+
+
+def build_schema(fanout, customers=1000):
+    schema = RelationalGenerator(5)
+    schema.add_table('customers', rows=customers)
+    schema.add_column('customers', 'id', 'id', 'random')
+    schema.add_table('orders', parent='customers', fanout=fanout)
+    schema.add_column('orders', 'id', 'id', 'random')
+    schema.add_column('orders', 'customer_id', 'reference', 'random', references='customers')
+    return schema
+
+
+def column(schema, table, name, batch_size=4096):
+    return np.concatenate([batch[name] for batch in schema.iter_batches(table, batch_size)])
+
+
+@pytest.mark.parametrize('fanout', [
+    {'distribution': 'poisson', 'mean': 3},
+    {'distribution': 'uniform', 'min': 0, 'max': 4},
+    {'distribution': 'fixed', 'count': 2},
+    {'distribution': 'weights', 'weights': [1, 0, 2]},
+])
+def test_fanout_counts_match_the_references(fanout):
+    schema = build_schema(fanout)
+    parent, fanout = schema.fanouts['orders']
+    references = column(schema, 'orders', 'customer_id', batch_size=333)
+
+    assert parent == 'customers'
+    assert len(references) == schema.rows['orders']
+    assert np.all(np.diff(references) >= 0)
+    assert np.array_equal(np.bincount(references, minlength=1000), fanout.counts(0, 1000))
+
+
+def test_fanout_spans_several_parent_blocks():
+    parents = 2 * FANOUT_BLOCK + 100
+    schema = build_schema({'distribution': 'poisson', 'mean': 1.5}, customers=parents)
+    fanout = schema.fanouts['orders'][1]
+    references = column(schema, 'orders', 'customer_id', batch_size=50000)
+
+    assert len(references) == schema.rows['orders'] == int(fanout.counts(0, parents).sum())
+    assert np.array_equal(np.bincount(references, minlength=parents), fanout.counts(0, parents))
+    window = fanout.parents(FANOUT_BLOCK, 1000)
+    assert np.array_equal(window, references[FANOUT_BLOCK:FANOUT_BLOCK + 1000])
+
+
+def test_uniform_references_stay_in_range():
+    schema = build_schema({'distribution': 'fixed', 'count': 1}, customers=50)
+    schema.add_column('orders', 'any_customer', 'reference', 'random', references='customers')
+    references = column(schema, 'orders', 'any_customer')
+    assert references.min() >= 0 and references.max() < 50
@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import RandomDataGenerator  # noqa: E402
+
+
+def build_generator(seed=11):
+    generator = RandomDataGenerator(seed)
+    generator.add_column('id', 'id', 'random')
+    generator.add_column('text', 'string', 'random', length=8, include_numbers=True)
+    generator.add_column('number', 'numeric', 'random', start=0, end=1000)
+    generator.add_column('normal', 'numeric', 'random', distribution='normal', mean=0, stddev=1)
+    generator.add_column('date', 'date', 'random', end_date='2020-01-01')
+    generator.add_column('country', 'country', 'random')
+    generator.add_column('custom', 'custom', 'random', custom_values=['a', 'b', 'c'], weights=[5, 3, 2])
+    return generator
+
+
+def read_bytes(filename):
+    with open(filename, 'rb') as output_file:
+        return output_file.read()
+
+
+@pytest.mark.parametrize('file_type', ['csv', 'jsonl', 'pgbinary'])
+def test_output_is_identical_across_workers_and_batch_sizes(tmp_path, file_type):
+    build_generator().save_to_file(tmp_path / 'expected', file_type, num_rows=3000, batch_size=3000)
+    expected = read_bytes(tmp_path / 'expected')
+    for workers, batch_size in [(None, 1), (None, 257), (2, 500), (3, 1024)]:
+        filename = tmp_path / f'{workers}-{batch_size}'
+        build_generator().save_to_file(filename, file_type, num_rows=3000, batch_size=batch_size, workers=workers)
+        assert read_bytes(filename) == expected, (workers, batch_size)
+
+
+def test_shards_concatenate_to_the_single_file(tmp_path):
+    build_generator().save_to_file(tmp_path / 'all.jsonl', 'jsonl', num_rows=2500)
+    shards = build_generator().save_shards(str(tmp_path / 'part.jsonl'), 'jsonl', num_rows=2500, shard_rows=600,
+                                           batch_size=128, workers=2)
+    assert [os.path.basename(shard) for shard in shards] == [f'part-{index:05d}.jsonl' for index in range(5)]
+    assert b''.join(read_bytes(shard) for shard in shards) == read_bytes(tmp_path / 'all.jsonl')
+
+
+def test_seed_determines_the_output(tmp_path):
+    for name, seed in [('first', 11), ('again', 11), ('other', 12)]:
+        build_generator(seed).save_to_file(tmp_path / name, 'csv', num_rows=500)
+    assert read_bytes(tmp_path / 'first') == read_bytes(tmp_path / 'again')
+    assert read_bytes(tmp_path / 'first') != read_bytes(tmp_path / 'other')
+
+
+@pytest.mark.parametrize('start, stop', [(0, 1), (0, 2000), (1, 2), (999, 1000), (123, 1777), (2000, 2000)])
+def test_generate_range_matches_generate_data(start, stop):
+    expected = build_generator().generate_data(2000)[start:stop]
+    assert build_generator().generate_range(start, stop) == expected
+
+
+def test_generate_range_keeps_id_as_row_index():
+    rows = build_generator().generate_range(40000, 40010)
+    assert [row['id'] for row in rows] == list(range(40000, 40010))
@@ -0,0 +1,75 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Permutation, RandomDataGenerator  # noqa: E402
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 10, 255, 256, 1000, 4097])
+def test_permutation_is_a_bijection(size):
+    values = Permutation(size, np.array([1, 2], dtype=np.uint64))(np.arange(size, dtype=np.uint64))
+    assert values.max() < size
+    assert np.array_equal(np.sort(values), np.arange(size, dtype=np.uint64))
+
+
+def test_permutation_depends_on_key():
+    indices = np.arange(1000, dtype=np.uint64)
+    first = Permutation(1000, np.array([1, 2], dtype=np.uint64))(indices)
+    second = Permutation(1000, np.array([1, 3], dtype=np.uint64))(indices)
+    assert not np.array_equal(first, second)
+
+
+def test_permutation_of_a_window_matches_the_full_range():
+    permutation = Permutation(5000, np.array([7, 8], dtype=np.uint64))
+    full = permutation(np.arange(5000, dtype=np.uint64))
+    assert np.array_equal(permutation(np.arange(1234, 2345, dtype=np.uint64)), full[1234:2345])
+
+
+@pytest.mark.parametrize('data_type, kwargs', [
+    ('string', {'length': 3}),
+    ('phone', {'number_length': 4}),
+    ('numeric', {'start': 0, 'end': 999}),
+])
+def test_unique_columns_fill_their_capacity_without_repeats(data_type, kwargs):
+    generator = RandomDataGenerator(1)
+    generator.add_column('value', data_type, 'random', unique=True, **kwargs)
+    capacity = generator.samplers[0].capacity
+    values = np.concatenate([batch['value'] for batch in generator.iter_batches(capacity, batch_size=333)])
+    assert len(np.unique(values)) == capacity
+
+
+@pytest.mark.parametrize('data_type, kwargs', [
+    ('string', {'length': 2}),
+    ('phone', {'number_length': 2}),
+    ('numeric', {'start': 1, 'end': 50}),
+])
+def test_unique_columns_reject_more_rows_than_capacity(data_type, kwargs):
+    generator = RandomDataGenerator(1)
+    generator.add_column('value', data_type, 'random', unique=True, **kwargs)
+    capacity = generator.samplers[0].capacity
+    generator.generate_columns(capacity)
+    with pytest.raises(ValueError, match='is unique but only has'):
+        generator.generate_columns(1, start=capacity)
+    with pytest.raises(ValueError, match='is unique but only has'):
+        generator.save_to_file(os.devnull, 'csv', num_rows=capacity + 1)
+
+
+def test_unique_id_has_no_capacity_limit():
+    generator = RandomDataGenerator(1)
+    generator.add_column('id', 'id', 'random', unique=True)
+    assert [row['id'] for row in generator.generate_data(3)] == [0, 1, 2]
+
+
+@pytest.mark.parametrize('data_type, kwargs', [
+    ('custom', {'custom_values': ['a', 'b']}),
+    ('numeric', {'distribution': 'normal'}),
+    ('numeric', {'is_float': True}),
+])
+def test_unique_is_rejected_where_values_cannot_be_distinct(data_type, kwargs):
+    generator = RandomDataGenerator(1)
+    with pytest.raises(ValueError):
+        generator.add_column('value', data_type, 'random', unique=True, **kwargs)